@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QWidget, QLabel, QListWidget, QVBoxLayout
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
+from gestureStore import GestureStore
+
 class GestureLibraryWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -21,9 +23,22 @@ class GestureLibraryWindow(QWidget):
 
         self.list_widget = QListWidget()
         self.list_widget.setStyleSheet("background-color: #1b1f27; padding: 10px; border-radius: 8px;")
-        self.list_widget.addItem("✅ wave")
-        self.list_widget.addItem("✅ fist")
-        self.list_widget.addItem("✅ peace")
         layout.addWidget(self.list_widget)
 
-        self.setLayout(layout)
\ No newline at end of file
+        self.setLayout(layout)
+
+        self.store = GestureStore()
+        self.refresh()
+
+    def refresh(self):
+        self.list_widget.clear()
+        gestures = self.store.names()
+        if not gestures:
+            self.list_widget.addItem("No gestures saved yet")
+        for name, count in gestures:
+            self.list_widget.addItem(f"✅ {name}  ({count} sample{'s' if count != 1 else ''})")
+
+    # Page lifecycle (UI/pageManager.py): pick up gestures captured since
+    # the page was last shown.
+    def resume(self):
+        self.refresh()
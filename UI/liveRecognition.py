@@ -1,10 +1,129 @@
+import time
+
 from PyQt5.QtWidgets import QWidget, QLabel, QPushButton, QVBoxLayout
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QFont, QImage, QPixmap
+
+from modelLoader import preloader, timer
+from UI.pageManager import camera_handles
+
+# cv2, the cascade and the predictor are imported inside the worker thread,
+# so opening this page never blocks the GUI on them.
+
+PREVIEW_WIDTH = 480
+STOP_TIMEOUT_MS = 1000   # longest stop() may hold the GUI thread
+
+# Workers that outlived stop() (still inside the model load); kept referenced
+# until they finish so the QThread is not destroyed while running.
+_detached = set()
+
+
+class RecognitionWorker(QThread):
+    # Owns the camera and the model; nothing in run() touches a widget.
+    result_ready = pyqtSignal(str, float, float, float)  # label, confidence, fps, inference ms
+    frame_ready = pyqtSignal(QImage)
+    status = pyqtSignal(str)
+
+    def __init__(self, predictor=None, camera_index=0):
+        super().__init__()
+        self.predictor = predictor
+        self.camera_index = camera_index
+        self._running = True
+
+    def run(self):
+        import cv2
+        from cascade import maybe_cascade
+        from predictor import load_predictor
+        from userSettings import load_settings
+
+        if self.predictor is None:
+            # Reuse the model home.py started loading behind the home page,
+            # unless the Detection Model setting changed since.
+            mode = load_settings()["model"]
+            if not preloader.ready:
+                self.status.emit("⏳ Loading model...")
+            preloaded = preloader.wait(mode, cancelled=lambda: not self._running)
+            if not self._running:
+                return
+            # A preload that failed or was for another mode: load here instead
+            self.predictor = preloaded or load_predictor(mode)
+            # stop() may have given up on us during the load
+            if not self._running:
+                return
+
+        classifier = maybe_cascade(self.predictor)
+
+        cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            self.status.emit("❌ Could not open camera.")
+            return
+        camera_handles.opened()
+
+        try:
+            fps = 0.0
+            last = time.perf_counter()
+            while self._running:
+                ret, frame = cap.read()
+                if not ret:
+                    self.status.emit("❌ Camera stopped delivering frames.")
+                    break
+                frame = cv2.flip(frame, 1)
+
+                start = time.perf_counter()
+                label, confidence = classifier.classify(frame)
+                inference_ms = 1000 * (time.perf_counter() - start)
+
+                now = time.perf_counter()
+                instant = 1 / max(now - last, 1e-6)
+                fps = instant if not fps else 0.9 * fps + 0.1 * instant
+                last = now
+
+                timer.mark("first_prediction")
+                self.result_ready.emit(label, confidence, fps, inference_ms)
+                self.frame_ready.emit(self._to_preview(frame))
+        finally:
+            cap.release()
+            camera_handles.released()
+
+    def _to_preview(self, frame):
+        import cv2
+
+        h, w = frame.shape[:2]
+        small = cv2.resize(frame, (PREVIEW_WIDTH, PREVIEW_WIDTH * h // w), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        # copy() detaches the QImage from the numpy buffer before it crosses threads
+        return QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
+
+    def stop(self, timeout_ms=STOP_TIMEOUT_MS):
+        # Never blocks the GUI for long: the camera loop notices _running
+        # within a frame, but a model load cannot be interrupted. A worker
+        # still loading is detached instead, with its signals cut, and deletes
+        # itself once run() returns. Returns True if the thread has finished.
+        self._running = False
+        if self.wait(timeout_ms):
+            return True
+        for signal in (self.result_ready, self.frame_ready, self.status):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass
+        _detached.add(self)
+        self.finished.connect(self._release)
+        if self.isFinished():  # finished between the wait and the connect
+            self._release()
+        return False
+
+    def _release(self):
+        _detached.discard(self)
+        self.deleteLater()
+
 
 class LiveRecognitionWindow(QWidget):
-    def __init__(self):
+    def __init__(self, predictor=None):
         super().__init__()
+        self.predictor = predictor
+        self.worker = None
         self.setStyleSheet("background-color: #0d1117; color: white;")
 
         layout = QVBoxLayout()
@@ -20,10 +139,65 @@ class LiveRecognitionWindow(QWidget):
         desc.setStyleSheet("color: #bbbbbb;")
         layout.addWidget(desc)
 
+        self.video_label = QLabel("📷 Camera not started")
+        self.video_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.video_label)
+
         self.status_label = QLabel("Current Gesture: ✋ None Detected")
         self.status_label.setFont(QFont("Segoe UI", 16))
         self.status_label.setAlignment(Qt.AlignCenter)
         self.status_label.setStyleSheet("margin-top: 40px; color: #80dfff;")
         layout.addWidget(self.status_label)
 
-        self.setLayout(layout)
\ No newline at end of file
+        self.perf_label = QLabel("")
+        self.perf_label.setFont(QFont("Segoe UI", 11))
+        self.perf_label.setAlignment(Qt.AlignCenter)
+        self.perf_label.setStyleSheet("color: #bbbbbb;")
+        layout.addWidget(self.perf_label)
+
+        self.setLayout(layout)
+
+    def start_recognition(self):
+        if self.worker is not None:
+            return
+        self.worker = RecognitionWorker(self.predictor)
+        self.worker.result_ready.connect(self.show_result)
+        self.worker.frame_ready.connect(self.show_frame)
+        self.worker.status.connect(self.status_label.setText)
+        self.worker.start()
+
+    def stop_recognition(self):
+        if self.worker is None:
+            return
+        self.worker.stop()
+        # Keep the loaded model so the next start skips the load
+        self.predictor = self.worker.predictor
+        self.worker = None
+        self.perf_label.setText("")
+
+    def show_result(self, label, confidence, fps, inference_ms):
+        icon = "✋" if label == "Hand" else "🚫"
+        self.status_label.setText(f"Current Gesture: {icon} {label} ({confidence*100:.1f}%)")
+        self.perf_label.setText(f"{fps:.1f} FPS  |  inference {inference_ms:.1f} ms")
+
+    def show_frame(self, image):
+        self.video_label.setPixmap(QPixmap.fromImage(image))
+
+    # Page lifecycle (UI/pageManager.py)
+    def suspend(self):
+        self.stop_recognition()
+
+    def resume(self):
+        self.start_recognition()
+
+    def showEvent(self, event):
+        self.start_recognition()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.stop_recognition()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        self.stop_recognition()
+        event.accept()
@@ -0,0 +1,153 @@
+import importlib
+import os
+import sys
+import threading
+import time
+
+# ==== CONFIG ====
+PAGE_BUDGET_MB = 300     # hidden pages are evicted, least recently used first, when the
+                         # pages cached hold more than this (see Page.cost_mb)
+MAX_CACHED_PAGES = 5     # ... and whenever more than this many pages are cached (HomePage has 5)
+
+
+# ==== OPEN CAMERA HANDLES ====
+# Incremented by every worker that opens a cv2.VideoCapture and decremented
+# on release, so leaks show up as a count instead of a busy webcam light.
+class CameraHandles:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def opened(self):
+        with self._lock:
+            self.count += 1
+
+    def released(self):
+        with self._lock:
+            self.count -= 1
+
+
+camera_handles = CameraHandles()
+
+
+def current_rss_mb():
+    # Current (not peak) resident set size; None when it cannot be read
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    return None
+
+
+# ==== PAGE MANAGER ====
+# Builds each page once and reuses it from then on. A page that leaves the
+# screen is suspended (camera, timers and inference stopped) and resumed
+# when it comes back. Pages opt in by defining suspend() / resume(); pages
+# without them are simply cached.
+#
+# The budget is charged per page, not against total RSS: once TensorFlow and
+# a model are loaded the process sits well above any fixed RSS figure, and
+# evicting pages would not give that memory back anyway. A page's cost is
+# what evicting it could free: the RSS growth while its widgets were built
+# (its modules are imported beforehand, since imports stay loaded) plus the
+# largest growth seen while it was on screen (camera buffers, previews),
+# measured each time it is left, before it is suspended.
+class Page:
+    def __init__(self, key, container, widget, build_mb=0.0):
+        self.key = key
+        self.container = container   # what goes into the stack (back button + widget)
+        self.widget = widget
+        self.build_mb = build_mb
+        self.peak_visible_mb = 0.0
+        self.shown_rss = None
+        self.last_used = time.monotonic()
+
+    @property
+    def cost_mb(self):
+        return self.build_mb + self.peak_visible_mb
+
+
+class PageManager:
+    def __init__(self, stack, home, budget_mb=PAGE_BUDGET_MB, max_pages=MAX_CACHED_PAGES):
+        self.stack = stack
+        self.home = home
+        self.budget_mb = budget_mb
+        self.max_pages = max_pages
+        self.factories = {}
+        self.modules = {}
+        self.pages = {}
+        self.current = None
+        self.built = 0
+        self.evicted = 0
+
+    def register(self, key, factory, modules=()):
+        # factory() -> (container, widget); `modules` are the ones it imports,
+        # loaded before the build is measured
+        self.factories[key] = factory
+        self.modules[key] = modules
+
+    def show(self, key):
+        page = self.pages.get(key)
+        if page is None:
+            for module in self.modules[key]:
+                importlib.import_module(module)
+            before = current_rss_mb()
+            container, widget = self.factories[key]()
+            after = current_rss_mb()
+            cost = max(after - before, 0.0) if before is not None and after is not None else 0.0
+            page = Page(key, container, widget, cost)
+            self.pages[key] = page
+            self.stack.addWidget(page.container)
+            self.built += 1
+        self._leave_current()
+        self.current = page
+        page.last_used = time.monotonic()
+        self.stack.setCurrentWidget(page.container)
+        page.shown_rss = current_rss_mb()
+        if hasattr(page.widget, "resume"):
+            page.widget.resume()
+        self.enforce_budget()
+        return page.widget
+
+    def show_home(self):
+        self._leave_current()
+        self.current = None
+        self.stack.setCurrentWidget(self.home)
+
+    def _leave_current(self):
+        if self.current is not None:
+            rss = current_rss_mb()
+            if rss is not None and self.current.shown_rss is not None:
+                grown = max(rss - self.current.shown_rss, 0.0)
+                self.current.peak_visible_mb = max(self.current.peak_visible_mb, grown)
+            if hasattr(self.current.widget, "suspend"):
+                self.current.widget.suspend()
+            self.current.last_used = time.monotonic()
+
+    def evict(self, key):
+        page = self.pages.pop(key)
+        if hasattr(page.widget, "suspend"):
+            page.widget.suspend()
+        self.stack.removeWidget(page.container)
+        page.container.deleteLater()
+        self.evicted += 1
+
+    def cached_mb(self):
+        return sum(p.cost_mb for p in self.pages.values())
+
+    def enforce_budget(self):
+        # Only hidden pages are candidates, least recently used first
+        idle = sorted((p for p in self.pages.values() if p is not self.current), key=lambda p: p.last_used)
+        for page in idle:
+            if self.cached_mb() <= self.budget_mb and len(self.pages) <= self.max_pages:
+                break
+            self.evict(page.key)
+
+    def stats(self):
+        return {"cached": len(self.pages), "built": self.built, "evicted": self.evicted,
+                "cached_mb": self.cached_mb(), "rss_mb": current_rss_mb(),
+                "open_cameras": camera_handles.count}
@@ -6,6 +6,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont, QPixmap, QColor, QPainter, QPen
 from PyQt5.QtCore import Qt, QTimer
 
+from userSettings import load_settings, save_settings
+
 
 class CalibrationPreview(QFrame):
     def __init__(self):
@@ -46,6 +48,7 @@ class HandCalibrationWindow(QWidget):
         self.setMinimumSize(1000, 600)
         self.setStyleSheet("background-color: #0d1117; color: white;")
 
+        settings = load_settings()
         main_layout = QHBoxLayout()
 
         # 🔹 Left Side: Camera + Calibration
@@ -96,28 +99,30 @@ class HandCalibrationWindow(QWidget):
         self.sensitivity_slider = QSlider(Qt.Horizontal)
         self.sensitivity_slider.setMinimum(1)
         self.sensitivity_slider.setMaximum(100)
-        self.sensitivity_slider.setValue(50)
+        self.sensitivity_slider.setValue(settings["sensitivity"])
 
         # Cooldown
         cooldown_label = QLabel("Cooldown (sec)")
         self.cooldown_input = QSpinBox()
         self.cooldown_input.setRange(0, 10)
-        self.cooldown_input.setValue(1)
+        self.cooldown_input.setValue(settings["cooldown"])
 
         # Confidence
         confidence_label = QLabel("Confidence Threshold")
         self.confidence_slider = QSlider(Qt.Horizontal)
         self.confidence_slider.setMinimum(50)
         self.confidence_slider.setMaximum(100)
-        self.confidence_slider.setValue(85)
+        self.confidence_slider.setValue(settings["confidence"])
 
         # Model Type
         model_label = QLabel("Detection Model")
         self.model_dropdown = QComboBox()
-        self.model_dropdown.addItems(["Fast", "Accurate"])
+        self.model_dropdown.addItems(["Fast", "Accurate", "Small"])  # predictor.MODES
+        self.model_dropdown.setCurrentText(settings["model"])
 
         # Save Button
         save_btn = QPushButton("Save & Apply")
+        save_btn.clicked.connect(self.apply_settings)
         save_btn.setStyleSheet("""
             QPushButton {
                 background-color: #80dfff;
@@ -150,6 +155,26 @@ class HandCalibrationWindow(QWidget):
         main_layout.addLayout(right_panel, 1)
         self.setLayout(main_layout)
 
+    # Page lifecycle (UI/pageManager.py): the calibration animation pauses
+    # while the page is off screen.
+    def suspend(self):
+        self._resume_timer = self.preview.timer.isActive()
+        self.preview.timer.stop()
+
+    def resume(self):
+        if getattr(self, "_resume_timer", False):
+            self.preview.timer.start(100)
+
+    def apply_settings(self):
+        settings = load_settings()
+        settings.update({
+            "sensitivity": self.sensitivity_slider.value(),
+            "cooldown": self.cooldown_input.value(),
+            "confidence": self.confidence_slider.value(),
+            "model": self.model_dropdown.currentText(),
+        })
+        save_settings(settings)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
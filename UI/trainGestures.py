@@ -1,26 +1,115 @@
 import cv2
-import json
 import random
+import threading
+import numpy as np
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QPushButton, QVBoxLayout,
-    QLineEdit, QMessageBox, QHBoxLayout
+    QLineEdit, QMessageBox, QHBoxLayout, QSizePolicy
 )
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import QThread, Qt, pyqtSignal
 from PyQt5.QtGui import QImage, QPixmap
 
+from UI.pageManager import camera_handles
+from gestureStore import GestureStore
+
+# Captured vectors are random placeholders until a landmark model exists;
+# recorded with every sample so they can be told apart later.
+FEATURE_VERSION = "placeholder-21"
+
+
+class CameraWorker(QThread):
+    # Reads the camera at its native rate and keeps the newest full-size
+    # frame for capture. A preview (already scaled to the label and converted
+    # to RGB) is only produced once the GUI has painted the previous one, so
+    # the preview rate follows whatever the display can actually consume.
+    frame_ready = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, camera_index=0):
+        super().__init__()
+        self.camera_index = camera_index
+        self._running = True
+        self._lock = threading.Lock()
+        self._consumed = threading.Event()
+        self._consumed.set()
+        self._target = (640, 480)
+
+        self._raw = None
+        self._frame = None
+        self._scaled = None
+        self._rgb = None
+
+    def set_target_size(self, width, height):
+        self._target = (max(width, 1), max(height, 1))
+
+    def frame_consumed(self):
+        self._consumed.set()
+
+    def latest_frame(self):
+        with self._lock:
+            return None if self._frame is None else self._frame.copy()
+
+    def _preview(self):
+        h, w = self._frame.shape[:2]
+        scale = min(self._target[0] / w, self._target[1] / h)
+        size = (max(int(w * scale), 1), max(int(h * scale), 1))
+        if self._rgb is None or self._rgb.shape[1::-1] != size:
+            self._scaled = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._rgb = np.empty_like(self._scaled)
+
+        with self._lock:
+            cv2.resize(self._frame, size, dst=self._scaled, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._scaled, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+    def preview_image(self):
+        # Called on the GUI thread. Wraps self._rgb without copying; safe
+        # because the worker does not write it again until frame_consumed().
+        h, w = self._rgb.shape[:2]
+        return QImage(self._rgb.data, w, h, 3 * w, QImage.Format_RGB888)
+
+    def run(self):
+        cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            self.failed.emit("❌ Could not open camera.")
+            return
+        camera_handles.opened()
+        try:
+            while self._running:
+                ret, self._raw = cap.read(self._raw)
+                if not ret:
+                    self.failed.emit("❌ Camera stopped delivering frames.")
+                    break
+                with self._lock:
+                    self._frame = cv2.flip(self._raw, 1, dst=self._frame)
+
+                if self._consumed.is_set():
+                    self._consumed.clear()
+                    self._preview()
+                    self.frame_ready.emit()
+        finally:
+            cap.release()
+            camera_handles.released()
+
+    def stop(self):
+        self._running = False
+        self.wait()
+
 
 class TrainGestureWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.setStyleSheet("background-color: #0d1117; color: white;")
-        self.cap = None
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.current_frame = None
+        self.worker = None
+        self._resume_camera = False
+        self.store = GestureStore()
 
         # UI
         self.video_label = QLabel("📷 Camera not started")
         self.video_label.setAlignment(Qt.AlignCenter)
+        # Ignored so the pixmap never drives the label size; the worker
+        # scales to the label instead.
+        self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.video_label.setMinimumSize(320, 240)
 
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("Enter gesture name...")
@@ -51,23 +140,40 @@ class TrainGestureWindow(QWidget):
         self.setLayout(layout)
 
     def start_camera(self):
-        self.cap = cv2.VideoCapture(0)
-        self.timer.start(30)
+        if self.worker is not None:
+            return
+        self.worker = CameraWorker()
+        self.worker.set_target_size(self.video_label.width(), self.video_label.height())
+        self.worker.frame_ready.connect(self.update_frame)
+        self.worker.failed.connect(self.camera_failed)
+        self.worker.start()
         self.capture_btn.setEnabled(True)
         self.status_label.setText("Camera started.")
 
     def update_frame(self):
-        if self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                frame = cv2.flip(frame, 1)
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb.shape
-                bytes_per_line = ch * w
-                image = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pix = QPixmap.fromImage(image)
-                self.video_label.setPixmap(pix)
-                self.current_frame = frame
+        # Ignore late signals from a worker that has already been stopped
+        if self.worker is None or self.sender() is not self.worker:
+            return
+        # fromImage copies the pixels, after which the worker may reuse its buffer
+        self.video_label.setPixmap(QPixmap.fromImage(self.worker.preview_image()))
+        self.worker.frame_consumed()
+
+    def camera_failed(self, message):
+        if self.worker is None or self.sender() is not self.worker:
+            return
+        # run() has returned or is about to; clearing the worker lets
+        # Start Camera try again
+        self.stop_camera()
+        self.status_label.setText(message)
+
+    @property
+    def current_frame(self):
+        return None if self.worker is None else self.worker.latest_frame()
+
+    def resizeEvent(self, event):
+        if self.worker is not None:
+            self.worker.set_target_size(self.video_label.width(), self.video_label.height())
+        super().resizeEvent(event)
 
     def capture_gesture(self):
         name = self.name_input.text().strip().lower()
@@ -80,24 +186,26 @@ class TrainGestureWindow(QWidget):
 
         vector = [round(random.uniform(0, 1), 2) for _ in range(21)]
 
-        try:
-            with open("gesture_data.json", "r") as f:
-                data = json.load(f)
-        except:
-            data = {}
-
-        data[name] = vector
-
-        with open("gesture_data.json", "w") as f:
-            json.dump(data, f, indent=2)
+        # One INSERT per capture; earlier samples of the same gesture are kept
+        self.store.add_sample(name, vector, model_version=FEATURE_VERSION)
 
         self.status_label.setText(f"✅ Gesture '{name}' saved!")
 
     def stop_camera(self):
-        if self.cap:
-            self.cap.release()
-            self.cap = None
-        self.timer.stop()
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+        self.capture_btn.setEnabled(False)
+
+    # Page lifecycle (UI/pageManager.py): the camera is released while the
+    # page is off screen and restarted if it was running.
+    def suspend(self):
+        self._resume_camera = self.worker is not None
+        self.stop_camera()
+
+    def resume(self):
+        if self._resume_camera:
+            self.start_camera()
 
     def closeEvent(self, event):
         self.stop_camera()
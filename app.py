@@ -1,10 +1,17 @@
+import time
+LAUNCHED_AT = time.perf_counter()  # before any other import, for the startup timings
+
 import sys
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from auth.signup import SignUpWindow
 from auth.login import LoginWindow
+from modelLoader import timer
+
 
 class AppController:
     def __init__(self):
+        timer.begin(LAUNCHED_AT)
         self.app = QApplication(sys.argv)
 
         self.signup_window = SignUpWindow(self.show_login)
@@ -13,6 +20,10 @@ class AppController:
         self.current_window = self.signup_window
         self.current_window.show()
 
+        # The auth screens never lead to HomePage, so no model is preloaded
+        # here; home.py starts the preload behind the page that uses it.
+        QTimer.singleShot(0, lambda: timer.mark("first_window"))
+
     def show_login(self):
         self.current_window.hide()
         self.current_window = self.login_window
@@ -24,7 +35,9 @@ class AppController:
         self.current_window.show()
 
     def run(self):
-        sys.exit(self.app.exec_())
+        code = self.app.exec_()
+        timer.report()
+        sys.exit(code)
 
 if __name__ == "__main__":
     controller = AppController()
@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import cv2
+
+from dataset import DATA_DIR, list_images
+from metrics import git_commit, peak_rss_mb, summarize
+from pipeline import RecognitionPipeline
+from predictor import MODES, load_predictor, to_label
+from test_webcam import annotate
+
+# ==== CONFIG ====
+RESULTS_DIR = "benchmarks"
+DEFAULT_FRAMES = 1000
+WARMUP_FRAMES = 20
+STAGES = ["capture", "preprocess", "predict", "annotate"]
+
+
+# ==== REPLAY SOURCES ====
+# Both behave like cv2.VideoCapture.read(), so the benchmark drives the
+# exact same loop code as the live recognizer.
+class ImageReplaySource:
+    def __init__(self, paths, frames, preload=False):
+        self.paths = paths
+        self.frames = frames
+        self.index = 0
+        self.cache = [cv2.imread(p) for p in paths] if preload else None
+
+    def read(self):
+        if self.index >= self.frames or not self.paths:
+            return False, None
+        i = self.index % len(self.paths)
+        self.index += 1
+        if self.cache is not None:
+            return True, self.cache[i].copy()
+        frame = cv2.imread(self.paths[i])
+        return frame is not None, frame
+
+    def release(self):
+        pass
+
+
+class VideoReplaySource:
+    def __init__(self, path, frames):
+        self.cap = cv2.VideoCapture(path)
+        self.frames = frames
+        self.index = 0
+
+    def read(self):
+        if self.index >= self.frames:
+            return False, None
+        self.index += 1
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+# ==== RUNS ====
+def run_serial(source, predictor):
+    timings = {stage: [] for stage in STAGES}
+    frames = 0
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        ret, frame = source.read()
+        if not ret:
+            break
+        frame = cv2.flip(frame, 1)
+        t1 = time.perf_counter()
+        batch = predictor.preprocess(frame)
+        t2 = time.perf_counter()
+        label, confidence = to_label(float(predictor.predict_array(batch)[0]))
+        t3 = time.perf_counter()
+        annotate(frame, label, confidence)
+        t4 = time.perf_counter()
+
+        frames += 1
+        if frames <= WARMUP_FRAMES:
+            start = t4
+            continue
+        for stage, elapsed in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            timings[stage].append(elapsed)
+        timings.setdefault("total", []).append(t4 - t0)
+
+    measured = max(frames - WARMUP_FRAMES, 0)
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": measured,
+        "fps": round(measured / elapsed, 2) if elapsed > 0 else 0.0,
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+    }
+
+
+def run_threaded(source, predictor):
+    pipeline = RecognitionPipeline(source, predictor.classify)
+    latencies = []
+    start = time.perf_counter()
+    pipeline.start()
+    try:
+        while True:
+            result = pipeline.latest_result(timeout=0.5)
+            if result is None:
+                if not pipeline.running:
+                    break
+                continue
+            annotate(result.image, result.label, result.confidence)
+            latencies.append(time.perf_counter() - result.captured_at)
+    finally:
+        pipeline.stop()
+    elapsed = time.perf_counter() - start
+    stats = pipeline.stats()
+    return {
+        "frames": stats["displayed"],
+        "fps": round(stats["displayed"] / elapsed, 2) if elapsed > 0 else 0.0,
+        "dropped_before_inference": stats["dropped_before_inference"],
+        "dropped_before_display": stats["dropped_before_display"],
+        "stages": {"end_to_end": summarize(latencies)},
+    }
+
+
+def print_results(results):
+    run = results["run"]
+    print(f"\n📊 {run['frames']} frames | {run['fps']} FPS | peak RSS {results['peak_rss_mb']} MB")
+    print(f"{'stage':>12} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for stage, s in run["stages"].items():
+        print(f"{stage:>12} {s['mean_ms']:>9.3f} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} "
+              f"{s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless benchmark of the live recognition loop")
+    parser.add_argument("--video", help="replay a recorded video instead of dataset images")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--preload", action="store_true",
+                        help="decode dataset images up front so capture excludes JPEG decode")
+    parser.add_argument("--pipeline", action="store_true", help="benchmark the threaded pipeline instead")
+    parser.add_argument("--model", choices=MODES)
+    parser.add_argument("--output", help="JSON path (default: benchmarks/<timestamp>_<commit>.json)")
+    args = parser.parse_args()
+
+    predictor = load_predictor(args.model)
+    if args.video:
+        source = VideoReplaySource(args.video, args.frames)
+    else:
+        paths = [path for path, _ in list_images(args.data_dir)]
+        source = ImageReplaySource(paths, args.frames, preload=args.preload)
+
+    run = run_threaded(source, predictor) if args.pipeline else run_serial(source, predictor)
+    source.release()
+
+    commit = git_commit()
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "config": {
+            "source": args.video or args.data_dir,
+            "frames": args.frames,
+            "preload": args.preload,
+            "mode": "pipeline" if args.pipeline else "serial",
+            "backend": predictor.backend,
+            "model": predictor.model_path,
+        },
+        "peak_rss_mb": round(peak_rss_mb() or 0.0, 1),
+        "run": run,
+    }
+    print_results(results)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{commit or 'nogit'}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"📝 Results written to {output}")
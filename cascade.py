@@ -0,0 +1,159 @@
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from dataClean import sharpness
+from dataset import DATA_DIR, list_images
+from predictor import LABELS, MODES, THRESHOLD, load_predictor
+from userSettings import load_settings
+
+# ==== CONFIG ====
+# Per-deployment values live under "cascade" in user_settings.json; these
+# are the fallbacks for any key not set there.
+DEFAULTS = {
+    "enabled": False,
+    "min_sharpness": 15,        # same Laplacian-variance check as dataClean
+    "min_brightness": 40,       # mean grey level, 0-255
+    "min_skin_fraction": 0.02,  # share of skin-coloured pixels
+}
+SKIN_SIZE = (64, 48)
+SKIN_LOW = np.array([0, 133, 77], dtype=np.uint8)     # YCrCb
+SKIN_HIGH = np.array([255, 173, 127], dtype=np.uint8)
+REJECT_CONFIDENCE = 0.99
+REPORT_PATH = "cascade_report.json"
+
+
+def load_config():
+    config = dict(DEFAULTS)
+    config.update(load_settings().get("cascade", {}))
+    return config
+
+
+# ==== STAGE 1: CHEAP PRE-FILTER ====
+class PreFilter:
+    def __init__(self, config):
+        self.config = config
+        self._small = np.empty((SKIN_SIZE[1], SKIN_SIZE[0], 3), dtype=np.uint8)
+        self._ycrcb = np.empty_like(self._small)
+        self._mask = np.empty((SKIN_SIZE[1], SKIN_SIZE[0]), dtype=np.uint8)
+
+    def reject_reason(self, frame):
+        # Returns None when the frame needs the CNN, otherwise why not.
+        cv2.resize(frame, SKIN_SIZE, dst=self._small, interpolation=cv2.INTER_AREA)
+        if self._small.mean() < self.config["min_brightness"]:
+            return "dark"
+
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2YCrCb, dst=self._ycrcb)
+        cv2.inRange(self._ycrcb, SKIN_LOW, SKIN_HIGH, dst=self._mask)
+        if cv2.countNonZero(self._mask) / self._mask.size < self.config["min_skin_fraction"]:
+            return "no_skin"
+
+        if sharpness(frame) < self.config["min_sharpness"]:
+            return "blurred"
+        return None
+
+
+# ==== CASCADE CLASSIFIER ====
+# Drop-in for predictor.classify: frames rejected by the pre-filter are
+# reported as "No Hand" without running the CNN.
+class CascadeClassifier:
+    def __init__(self, predictor, config=None):
+        self.predictor = predictor
+        self.prefilter = PreFilter(config or load_config())
+        self.frames = 0
+        self.passed = 0
+        self.rejected = {}
+
+    def classify(self, frame):
+        self.frames += 1
+        reason = self.prefilter.reject_reason(frame)
+        if reason is not None:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+            return LABELS[1], REJECT_CONFIDENCE
+        self.passed += 1
+        return self.predictor.classify(frame)
+
+    @property
+    def pass_through_rate(self):
+        return self.passed / max(self.frames, 1)
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "passed_to_cnn": self.passed,
+            "pass_through_rate": self.pass_through_rate,
+            "rejected": dict(self.rejected),
+        }
+
+
+def maybe_cascade(predictor):
+    config = load_config()
+    return CascadeClassifier(predictor, config) if config["enabled"] else predictor
+
+
+# ==== DATASET1 EVALUATION ====
+def evaluate(predictor, config, data_dir=DATA_DIR):
+    samples = list_images(data_dir)
+    cascade = CascadeClassifier(predictor, config)
+    cnn_correct = cascade_correct = false_rejects = 0
+    cnn_time = cascade_time = 0.0
+
+    for path, label in samples:
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+
+        start = time.perf_counter()
+        cnn_label = int(predictor.predict_frame(frame) > THRESHOLD)
+        cnn_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        cascade_label = LABELS.index(cascade.classify(frame)[0])
+        cascade_time += time.perf_counter() - start
+
+        cnn_correct += cnn_label == label
+        cascade_correct += cascade_label == label
+        false_rejects += label == 0 and cascade_label == 1 and cnn_label == 0
+
+    total = max(cascade.frames, 1)
+    return {
+        "samples": cascade.frames,
+        "config": config,
+        "cnn_accuracy": cnn_correct / total,
+        "cascade_accuracy": cascade_correct / total,
+        "accuracy_delta": (cascade_correct - cnn_correct) / total,
+        "hand_frames_wrongly_rejected": false_rejects,
+        "cnn_ms_per_frame": 1000 * cnn_time / total,
+        "cascade_ms_per_frame": 1000 * cascade_time / total,
+        **cascade.stats(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the pre-filter cascade on dataset1")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--model", choices=MODES)
+    parser.add_argument("--min-sharpness", type=float)
+    parser.add_argument("--min-brightness", type=float)
+    parser.add_argument("--min-skin-fraction", type=float)
+    args = parser.parse_args()
+
+    config = load_config()
+    for key in ("min_sharpness", "min_brightness", "min_skin_fraction"):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+
+    report = evaluate(load_predictor(args.model), config, args.data_dir)
+    print(f"\n📊 {report['samples']} images from '{args.data_dir}'")
+    print(f"   Pass-through to CNN: {report['pass_through_rate']*100:.1f}%  rejected: {report['rejected']}")
+    print(f"   Accuracy CNN only {report['cnn_accuracy']*100:.2f}% | cascade {report['cascade_accuracy']*100:.2f}% "
+          f"(Δ {report['accuracy_delta']*100:+.2f}%)")
+    print(f"   Hand frames wrongly rejected: {report['hand_frames_wrongly_rejected']}")
+    print(f"   Time per frame CNN only {report['cnn_ms_per_frame']:.2f} ms | cascade {report['cascade_ms_per_frame']:.2f} ms")
+
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Report written to {REPORT_PATH}")
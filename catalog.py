@@ -0,0 +1,265 @@
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# ==== CONFIG ====
+CATALOG_PATH = "dataset_catalog.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path     TEXT PRIMARY KEY,
+    label    TEXT,
+    source   TEXT,
+    hash     TEXT,
+    width    INTEGER,
+    height   INTEGER,
+    quality  REAL,
+    split    TEXT,
+    size     INTEGER,
+    mtime    REAL,
+    added_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_images_label   ON images(label);
+CREATE INDEX IF NOT EXISTS idx_images_split   ON images(split);
+CREATE INDEX IF NOT EXISTS idx_images_hash    ON images(hash);
+CREATE INDEX IF NOT EXISTS idx_images_source  ON images(source);
+CREATE INDEX IF NOT EXISTS idx_images_quality ON images(quality);
+
+-- next free number per (directory, prefix), so ingest scripts never count
+-- directory entries to pick a filename
+CREATE TABLE IF NOT EXISTS counters (
+    directory TEXT,
+    prefix    TEXT,
+    next      INTEGER,
+    PRIMARY KEY (directory, prefix)
+);
+"""
+
+COLUMNS = ["path", "label", "source", "hash", "width", "height", "quality", "split", "size", "mtime"]
+
+
+def _norm(path):
+    return os.path.normpath(path).replace("\\", "/")
+
+
+class Catalog:
+    # One connection shared behind a lock, so ingest worker threads can
+    # record files as they are written.
+    def __init__(self, path=CATALOG_PATH):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    # ---- filenames ----
+    def next_name(self, directory, prefix, ext, width=5):
+        directory = _norm(directory)
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute("SELECT next FROM counters WHERE directory=? AND prefix=?",
+                                        (directory, prefix)).fetchone()
+                number = row[0] if row else self._seed_counter(directory, prefix)
+                self.conn.execute("INSERT OR REPLACE INTO counters VALUES (?, ?, ?)",
+                                  (directory, prefix, number + 1))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return os.path.join(directory, f"{prefix}{number:0{width}d}{ext}")
+
+    def _seed_counter(self, directory, prefix):
+        # First use for this folder: one directory scan, never repeated
+        pattern = re.compile(rf"^{re.escape(prefix)}(\d+)\.")
+        names = os.listdir(directory) if os.path.isdir(directory) else []
+        numbers = [int(m.group(1)) for m in map(pattern.match, names) if m]
+        return max(numbers, default=-1) + 1
+
+    # ---- records ----
+    def add(self, path, label=None, source=None, hash=None, width=None, height=None,
+            quality=None, split=None):
+        self.add_many([dict(path=path, label=label, source=source, hash=hash, width=width,
+                            height=height, quality=quality, split=split)])
+
+    def add_many(self, records):
+        rows = []
+        now = time.time()
+        for r in records:
+            path = _norm(r["path"])
+            try:
+                stat = os.stat(path)
+                size, mtime = stat.st_size, stat.st_mtime
+            except OSError:
+                size = mtime = None
+            rows.append((path, r.get("label"), r.get("source"), r.get("hash"), r.get("width"),
+                         r.get("height"), r.get("quality"), r.get("split"), size, mtime, now))
+        with self.lock:
+            self._batch("""
+                INSERT INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    label=COALESCE(excluded.label, label), source=COALESCE(excluded.source, source),
+                    hash=COALESCE(excluded.hash, hash), width=COALESCE(excluded.width, width),
+                    height=COALESCE(excluded.height, height), quality=COALESCE(excluded.quality, quality),
+                    split=COALESCE(excluded.split, split), size=excluded.size, mtime=excluded.mtime
+            """, rows)
+
+    def move(self, old_path, new_path, source=None):
+        # Keeps the row's fields; files that were never catalogued get a new row
+        with self.lock:
+            moved = self.conn.execute("UPDATE images SET path=? WHERE path=?",
+                                      (_norm(new_path), _norm(old_path))).rowcount
+        if not moved:
+            self.add(new_path, source=source)
+
+    def remove(self, path):
+        with self.lock:
+            self.conn.execute("DELETE FROM images WHERE path=?", (_norm(path),))
+
+    def set_split(self, paths, split):
+        with self.lock:
+            self._batch("UPDATE images SET split=? WHERE path=?", [(split, _norm(p)) for p in paths])
+
+    def _batch(self, sql, rows):
+        # One transaction for the whole batch; rolled back on any error so the
+        # connection (autocommit mode) is never left inside an open BEGIN.
+        # Callers hold self.lock.
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(sql, rows)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    # ---- queries ----
+    def _where(self, label=None, split=None, source=None, min_quality=None, directory=None):
+        clauses, params = [], []
+        for column, value in (("label", label), ("split", split), ("source", source)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if min_quality is not None:
+            clauses.append("quality >= ?")
+            params.append(min_quality)
+        if directory is not None:
+            # Range on the primary key rather than LIKE, which cannot use the
+            # index (and would treat _ and % in folder names as wildcards);
+            # "0" is the character right after "/".
+            prefix = _norm(directory)
+            clauses.append("path >= ? AND path < ?")
+            params += [prefix + "/", prefix + "0"]
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=None, **filters):
+        where, params = self._where(**filters)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM images{where} ORDER BY path"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            return [dict(zip(COLUMNS, row)) for row in self.conn.execute(sql, params)]
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM images{where}", params).fetchone()[0]
+
+    def names_in(self, directory):
+        return {os.path.basename(r["path"]) for r in self.query(directory=directory)}
+
+    def samples(self, data_dir, class_names, exts):
+        # (path, class index) pairs for the files directly inside each class
+        # folder, in dataset.list_images order (class, then filename), so
+        # seeded splits come out the same as from a directory scan.
+        samples = []
+        for label, class_name in enumerate(class_names):
+            class_dir = _norm(os.path.join(data_dir, class_name))
+            samples += [(r["path"], label) for r in self.query(directory=class_dir)
+                        if os.path.dirname(r["path"]) == class_dir
+                        and os.path.splitext(r["path"])[1].lower() in exts]
+        return samples
+
+    # ---- backfill ----
+    def sync_folder(self, directory, label=None, source="sync", exts=(".jpg", ".jpeg", ".png")):
+        # Records files that were added outside the ingest scripts and drops
+        # entries whose file is gone. Unchanged files are not re-read.
+        import cv2
+        from dataClean import file_hash, sharpness
+
+        known = {r["path"]: r for r in self.query(directory=directory)}
+        present, records = set(), []
+        for name in os.listdir(directory):
+            if os.path.splitext(name)[1].lower() not in exts:
+                continue
+            path = _norm(os.path.join(directory, name))
+            present.add(path)
+            stat = os.stat(path)
+            row = known.get(path)
+            if row and row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+                continue
+            img = cv2.imread(path)
+            records.append(dict(path=path, label=label, source=source, hash=file_hash(path),
+                                width=None if img is None else img.shape[1],
+                                height=None if img is None else img.shape[0],
+                                quality=None if img is None else float(sharpness(img))))
+        if records:
+            self.add_many(records)
+        for path in set(known) - present:
+            self.remove(path)
+        return len(records), len(set(known) - present)
+
+
+def describe_image(img, path=None):
+    # hash / width / height / quality fields for a freshly written BGR image
+    from dataClean import file_hash, sharpness
+    fields = dict(width=img.shape[1], height=img.shape[0], quality=float(sharpness(img)))
+    if path is not None:
+        fields["hash"] = file_hash(path)
+    return fields
+
+
+if __name__ == "__main__":
+    from dataset import CLASS_NAMES, DATA_DIR, split_samples
+
+    parser = argparse.ArgumentParser(description="Dataset catalog")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="index the class folders under --data-dir")
+    sync.add_argument("--data-dir", default=DATA_DIR)
+    split = sub.add_parser("assign-split", help="record the train/val split used by train.py")
+    split.add_argument("--data-dir", default=DATA_DIR)
+    split.add_argument("--dedupe", action="store_true", help="keep near-duplicate clusters on one side")
+    query = sub.add_parser("query", help="list matching images")
+    query.add_argument("--label")
+    query.add_argument("--split")
+    query.add_argument("--source")
+    query.add_argument("--min-quality", type=float)
+    query.add_argument("--limit", type=int)
+    sub.add_parser("stats", help="counts per label, split and source")
+    args = parser.parse_args()
+
+    catalog = Catalog()
+    if args.command == "sync":
+        for name in CLASS_NAMES:
+            added, removed = catalog.sync_folder(os.path.join(args.data_dir, name), label=name)
+            print(f"🗂️ {name}: {added} added/updated, {removed} removed")
+    elif args.command == "assign-split":
+        train_samples, val_samples = split_samples(args.data_dir, dedupe=args.dedupe)
+        catalog.set_split([p for p, _ in train_samples], "train")
+        catalog.set_split([p for p, _ in val_samples], "val")
+        print(f"🗂️ {len(train_samples)} train / {len(val_samples)} val")
+    elif args.command == "query":
+        for row in catalog.query(limit=args.limit, label=args.label, split=args.split,
+                                 source=args.source, min_quality=args.min_quality):
+            print(row["path"])
+    else:
+        with catalog.lock:
+            for column in ("label", "split", "source"):
+                rows = catalog.conn.execute(
+                    f"SELECT {column}, COUNT(*) FROM images GROUP BY {column} ORDER BY 2 DESC").fetchall()
+                print(f"{column:>7}: " + ", ".join(f"{value}={n}" for value, n in rows))
@@ -1,20 +1,192 @@
+import argparse
+import queue
+import threading
+import time
+
 import cv2
 import os
 
+from catalog import Catalog, describe_image
+from dataset import list_images
+from dedupe import INDEX_PATH, PHashIndex, dhash, update_index
+
+# ==== CONFIG ====
+CLASSES = {ord('h'): "hand", ord('n'): "no_hand"}
+BURST_RATE = 10.0      # frames per second recorded during a burst
+BURST_SECONDS = 3.0    # length of a timed burst (Shift+H / Shift+N)
+REPEAT_WINDOW = 0.6    # longer than the OS key-repeat delay: events this close mean the key is held
+WRITER_THREADS = 2
+QUEUE_SIZE = 64        # frames waiting for JPEG encode + write; full queue drops, never blocks
+CLOSE_TIMEOUT = 10.0   # seconds close() waits for the writers to make room
+
+
+# ==== BACKGROUND WRITER ====
+# JPEG encoding, the disk write and the catalog entry all happen off the
+# capture loop, so the preview never waits on a save. With a PHashIndex,
+# every saved frame is added to it; with skip_duplicates, frames that
+# near-duplicate an indexed image are not saved at all.
+class FrameWriter:
+    def __init__(self, catalog, index=None, skip_duplicates=False, threads=WRITER_THREADS,
+                 queue_size=QUEUE_SIZE):
+        self.catalog = catalog
+        self.index = index
+        self.skip_duplicates = skip_duplicates and index is not None
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._run, daemon=True) for _ in range(threads)]
+        for t in self.threads:
+            t.start()
+
+    def submit(self, frame, label, burst=None):
+        # `burst` (if any) is credited with the frame's outcome once written
+        try:
+            self.queue.put_nowait((frame, label, burst))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            frame, label, burst = item
+            # Any error is counted and the thread moves on: a dead writer
+            # would leave close() waiting on a full queue.
+            try:
+                outcome = self._write(frame, label)
+            except Exception as e:
+                print(f"⚠️ Could not save a {label} frame: {type(e).__name__}: {e}")
+                outcome = "failed"
+            with self.lock:
+                setattr(self, outcome, getattr(self, outcome) + 1)
+                if burst is not None:
+                    burst.outcomes[outcome] += 1
+
+    def _write(self, frame, label):
+        # Returns the counter to bump: "written" or "duplicates"
+        filepath = self.catalog.next_name(f"dataset1/{label}", f"{label}_", ".jpg", width=0)
+        h = None
+        if self.index is not None:
+            h = dhash(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+            with self.lock:
+                if self.skip_duplicates:
+                    if self.index.admit(filepath, h):
+                        return "duplicates"
+                else:
+                    self.index.add(filepath, h)
+        try:
+            ok, encoded = cv2.imencode(".jpg", frame)
+            if not ok:
+                raise OSError("JPEG encode failed")
+            with open(filepath, "wb") as f:
+                f.write(encoded.tobytes())
+            self.catalog.add(filepath, label=label, source="collectImages",
+                             **describe_image(frame, filepath))
+        except Exception:
+            if h is not None:
+                with self.lock:
+                    self.index.remove(filepath)
+            raise
+        if h is not None:
+            with self.lock:
+                self.index.add(filepath, h, os.stat(filepath))  # now with mtime/size
+        return "written"
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        # Drains everything already queued before returning, unless the
+        # writers stop taking frames for `timeout` seconds
+        for _ in self.threads:
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                print(f"⚠️ Writers stalled; {self.queue.qsize()} queued frames not saved")
+                return
+        for t in self.threads:
+            t.join(timeout)
+
+
+# ==== BURST ====
+# Paces captures to the target rate. A camera slower than the target shows
+# up as an achieved rate below it; frames the writer could not take are
+# counted as dropped. The writer threads fill in `outcomes`, so the report
+# counts frames actually saved, and waits until none are still queued.
+class Burst:
+    def __init__(self, label, rate, until=None):
+        self.label = label
+        self.period = 1.0 / rate
+        self.until = until            # timed burst end; None while the key is held
+        self.started = time.perf_counter()
+        self.ended = None
+        self.next_due = self.started
+        self.captured = 0             # frames handed to the writer
+        self.dropped = 0
+        self.outcomes = {"written": 0, "duplicates": 0, "failed": 0}
+
+    def due(self, now):
+        if now < self.next_due:
+            return False
+        # Never try to catch up after a slow frame; just keep the pace
+        self.next_due = max(self.next_due + self.period, now)
+        return True
+
+    def stop(self):
+        self.ended = time.perf_counter()
+
+    @property
+    def pending(self):
+        return self.captured - self.dropped - sum(self.outcomes.values())
+
+    def report(self):
+        elapsed = max((self.ended or time.perf_counter()) - self.started, 1e-9)
+        target = 1.0 / self.period
+        saved = self.outcomes["written"]
+        print(f"📊 {self.label} burst: {saved} frames saved in {elapsed:.1f} s "
+              f"({saved / elapsed:.1f} fps of {target:.0f} target), {self.dropped} dropped, "
+              f"{self.outcomes['duplicates']} near-duplicates skipped, {self.outcomes['failed']} failed")
+
+
+parser = argparse.ArgumentParser(description="Collect hand / no-hand training images")
+parser.add_argument("--rate", type=float, default=BURST_RATE, help="burst capture rate (frames/s)")
+parser.add_argument("--burst-seconds", type=float, default=BURST_SECONDS, help="length of a Shift+H/N burst")
+parser.add_argument("--camera", type=int, default=0)
+parser.add_argument("--skip-duplicates", action="store_true",
+                    help="do not save frames that near-duplicate an image already in the dataset")
+args = parser.parse_args()
+
 # Create directories if they don't exist
 os.makedirs("dataset1/hand", exist_ok=True)
 os.makedirs("dataset1/no_hand", exist_ok=True)
 
-cap = cv2.VideoCapture(0)
+cap = cv2.VideoCapture(args.camera)
 cv2.namedWindow("Collect Data", cv2.WINDOW_NORMAL)
 
-hand_count = len(os.listdir("dataset1/hand"))
-nohand_count = len(os.listdir("dataset1/no_hand"))
+# File numbers come from the catalog, so the folders are never listed
+catalog = Catalog()
+# The same index dataset.split_samples(dedupe=True) keeps, updated as frames
+# are saved, so they are not hashed again at split time
+index = PHashIndex.load(INDEX_PATH)
+if args.skip_duplicates:
+    # Only rejection needs the index complete up front. In-process: this
+    # script has no __main__ guard for pool workers to import.
+    hashed = update_index(index, [path for path, _ in list_images("dataset1")], workers=1)
+    print(f"🔎 Near-duplicate index: {len(index.hashes)} images ({hashed} hashed now)")
+writer = FrameWriter(catalog, index, args.skip_duplicates)
 
 print("📸 Press 'H' to save hand image")
 print("🌫️ Press 'N' to save no-hand image")
+print(f"⏺️ Hold H/N to record at {args.rate:.0f} fps, Shift+H/N for a {args.burst_seconds:.0f} s burst")
 print("❌ Press 'Q' to quit")
 
+burst = None
+finished = []  # ended bursts whose frames are still being written
+last_key, last_key_at = None, 0.0
+
 while True:
     ret, frame = cap.read()
     if not ret:
@@ -22,29 +194,66 @@ while True:
 
     frame = cv2.flip(frame, 1)
     display_frame = frame.copy()
+    now = time.perf_counter()
 
-    cv2.putText(display_frame, "Press H - Hand | N - No Hand | Q - Quit", (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    key = cv2.waitKey(1) & 0xFF
+    lower = key | 0x20 if ord('A') <= key <= ord('Z') else key
 
-    cv2.imshow("Collect Data", display_frame)
+    if key == ord('q'):
+        print("🛑 Quitting image collection.")
+        break
 
-    key = cv2.waitKey(1) & 0xFF
+    if lower in CLASSES:
+        label = CLASSES[lower]
+        if key != lower:
+            # Shift: timed burst
+            if burst is not None:
+                burst.stop()
+                finished.append(burst)
+            burst = Burst(label, args.rate, until=now + args.burst_seconds)
+        elif burst is None and key == last_key and now - last_key_at < REPEAT_WINDOW:
+            # Repeat events: the key is being held
+            burst = Burst(label, args.rate)
+        elif burst is None:
+            # Single press: one image, as before
+            if writer.submit(frame, label):
+                print(f"✅ Queued {label.upper().replace('_', '-')} image")
+        last_key, last_key_at = key, now
 
-    if key == ord('h'):
-        filepath = f"dataset1/hand/hand_{hand_count}.jpg"
-        cv2.imwrite(filepath, frame)
-        hand_count += 1
-        print(f"✅ Saved HAND image #{hand_count} -> {filepath}")
+    if burst is not None:
+        held = burst.until is None and last_key is not None and now - last_key_at < REPEAT_WINDOW
+        if held or (burst.until is not None and now < burst.until):
+            if burst.due(now):
+                burst.captured += 1
+                if not writer.submit(frame, burst.label, burst):
+                    burst.dropped += 1
+        else:
+            burst.stop()
+            finished.append(burst)
+            burst = None
 
-    elif key == ord('n'):
-        filepath = f"dataset1/no_hand/no_hand_{nohand_count}.jpg"
-        cv2.imwrite(filepath, frame)
-        nohand_count += 1
-        print(f"✅ Saved NO-HAND image #{nohand_count} -> {filepath}")
+    for done in [b for b in finished if b.pending == 0]:
+        done.report()
+        finished.remove(done)
 
-    elif key == ord('q'):
-        print("🛑 Quitting image collection.")
-        break
+    status = "Press H - Hand | N - No Hand | Q - Quit"
+    if burst is not None:
+        status = f"REC {burst.label}: {burst.outcomes['written']}/{burst.captured} saved, queue {writer.queue.qsize()}"
+    cv2.putText(display_frame, status, (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+    cv2.imshow("Collect Data", display_frame)
+
+if burst is not None:
+    burst.stop()
+    finished.append(burst)
 
 cap.release()
 cv2.destroyAllWindows()
+writer.close()
+for done in finished:
+    done.report()
+catalog.close()
+index.save(INDEX_PATH)
+print(f"✅ Saved {writer.written} images ({writer.dropped} dropped at a full queue, "
+      f"{writer.duplicates} near-duplicates skipped, {writer.failed} failed)")
@@ -1,46 +1,173 @@
+import hashlib
+import json
 import os
+import time
+from multiprocessing import Pool
+
 import cv2
 from tqdm import tqdm
 
+from catalog import Catalog
+from dedupe import PHashIndex, dhash
+
 # ==== CONFIGURATION ====
 INPUT_FOLDER = "preclean_folder"
 OUTPUT_FOLDER = "dataset/cleannohands"
+MANIFEST_PATH = os.path.join(OUTPUT_FOLDER, "clean_manifest.jsonl")
+PHASH_INDEX_PATH = os.path.join(OUTPUT_FOLDER, "phash_index.json")  # perceptual hashes of saved outputs
+SKIP_NEAR_DUPLICATES = False  # True: drop outputs that near-duplicate one already saved
 IMAGE_SIZE = (128, 128)
 VALID_EXTS = ['.jpg', '.jpeg', '.png']
 MIN_IMAGE_DIM = 50
+MIN_SHARPNESS = 15  # variance of the Laplacian; lower means blurred
+OUTPUT_PREFIX = "hand_"
+OUTPUT_LABEL = None  # catalog label for this batch ("hand" / "no_hand"), None if not yet sorted
+WORKERS = os.cpu_count() or 1
+CHUNKSIZE = 16
 
-# ==== SETUP ====
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-existing_files = [f for f in os.listdir(OUTPUT_FOLDER) if f.endswith(tuple(VALID_EXTS))]
-image_count = len(existing_files)  # Start after last image in output
+# ==== VALIDATION FUNCTIONS ====
+def sharpness(img):
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return cv2.Laplacian(gray, cv2.CV_64F).var()
 
-# ==== VALIDATION FUNCTION ====
-def is_valid_image(img):
+def rejection_reason(img):
     if img is None:
-        return False
+        return "unreadable"
     if img.shape[0] < MIN_IMAGE_DIM or img.shape[1] < MIN_IMAGE_DIM:
-        return False
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    if cv2.Laplacian(gray, cv2.CV_64F).var() < 15:
-        return False
-    return True
+        return "too_small"
+    if sharpness(img) < MIN_SHARPNESS:
+        return "blurred"
+    return None
+
+def is_valid_image(img):
+    return rejection_reason(img) is None
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
 
-# ==== MAIN LOOP ====
-for filename in tqdm(os.listdir(INPUT_FOLDER)):
-    ext = os.path.splitext(filename)[-1].lower()
-    if ext not in VALID_EXTS:
-        continue
+# ==== MANIFEST ====
+# One JSON line per processed input: source path, size, mtime, content
+# hash and outcome. Re-runs skip anything already recorded, by path+stat
+# first and by content hash second (catches renamed copies).
+def load_manifest(path=MANIFEST_PATH):
+    by_source, hashes = {}, set()
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by an interrupted run
+                if entry["outcome"] == "error":
+                    continue  # retried on the next run
+                by_source[entry["source"]] = entry
+                hashes.add(entry["hash"])
+    return by_source, hashes
 
+# ==== WORKER ====
+# Runs in a pool process. The output name is assigned by the parent before
+# the task is queued, so concurrent workers can never pick the same file.
+# Saved images come back with their catalog fields plus their dHash, which
+# the parent adds to the near-duplicate index.
+def clean_one(task):
+    path, output_path = task
     try:
-        path = os.path.join(INPUT_FOLDER, filename)
         img = cv2.imread(path)
+        reason = rejection_reason(img)
+        if reason is not None:
+            return path, reason, None, None, None
+        resized = cv2.resize(img, IMAGE_SIZE)
+        if not cv2.imwrite(output_path, resized):
+            return path, "error", None, "imwrite failed", None
+        record = {"path": output_path, "label": OUTPUT_LABEL, "source": "dataClean",
+                  "hash": file_hash(output_path), "width": IMAGE_SIZE[0], "height": IMAGE_SIZE[1],
+                  "quality": float(sharpness(img)),
+                  "phash": dhash(cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY))}
+        return path, "saved", os.path.basename(output_path), None, record
+    except Exception as e:
+        return path, "error", None, f"{type(e).__name__}: {e}", None
+
+def pending_tasks(candidates, by_source, hashes, stats, hash_of, duplicates, catalog, progress):
+    # Consumed by the pool's feeder thread, so work starts streaming before
+    # the whole input folder has been hashed. Output numbers come from the
+    # catalog counter, so deleted files are never reused. Inputs that never
+    # reach a worker advance the progress bar here.
+    for path in candidates:
+        stat = os.stat(path)
+        seen = by_source.get(path)
+        if seen and seen["size"] == stat.st_size and seen["mtime"] == stat.st_mtime:
+            stats["skipped"] += 1
+            progress.update()
+            continue
+        digest = file_hash(path)
+        if digest in hashes:
+            stats["duplicate"] += 1
+            duplicates.append({"source": path, "size": stat.st_size, "mtime": stat.st_mtime,
+                               "hash": digest, "outcome": "duplicate", "output": None})
+            progress.update()
+            continue
+        hashes.add(digest)
+        hash_of[path] = (digest, stat.st_size, stat.st_mtime)
+        yield path, catalog.next_name(OUTPUT_FOLDER, OUTPUT_PREFIX, ".jpg")
+
+if __name__ == "__main__":
+    # ==== SETUP ====
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    by_source, hashes = load_manifest()
+    candidates = [
+        os.path.join(INPUT_FOLDER, f) for f in sorted(os.listdir(INPUT_FOLDER))
+        if os.path.splitext(f)[-1].lower() in VALID_EXTS
+    ]
+    stats = {"skipped": 0, "duplicate": 0, "saved": 0, "error": 0}
+    rejected = {}
+    hash_of = {}
+    duplicates = []
+    catalog = Catalog()
+    index = PHashIndex.load(PHASH_INDEX_PATH)
+
+    # ==== MAIN LOOP ====
+    start = time.perf_counter()
+    progress = tqdm(total=len(candidates))
+    tasks = pending_tasks(candidates, by_source, hashes, stats, hash_of, duplicates, catalog, progress)
+    with Pool(WORKERS) as pool, open(MANIFEST_PATH, "a") as manifest, progress:
+        for path, outcome, output, error, record in pool.imap_unordered(clean_one, tasks, CHUNKSIZE):
+            progress.update()
+            digest, size, mtime = hash_of.pop(path)
+            if record is not None:
+                # Admitted one at a time here, so two workers' near-copies
+                # cannot both get in
+                phash = record.pop("phash")
+                if not SKIP_NEAR_DUPLICATES:
+                    index.add(record["path"], phash, os.stat(record["path"]))
+                elif index.admit(record["path"], phash, os.stat(record["path"])):
+                    os.remove(record["path"])
+                    outcome, output, record = "near_duplicate", None, None
+            entry = {"source": path, "size": size, "mtime": mtime, "hash": digest,
+                     "outcome": outcome, "output": output}
+            if error:
+                entry["error"] = error
+                tqdm.write(f"⚠️ {path}: {error}")
+            manifest.write(json.dumps(entry) + "\n")
+            if record is not None:
+                catalog.add(**record)
+
+            if outcome in stats:
+                stats[outcome] += 1
+            else:
+                rejected[outcome] = rejected.get(outcome, 0) + 1
 
-        if is_valid_image(img):
-            resized = cv2.resize(img, IMAGE_SIZE)
-            new_name = f"hand_{image_count:05d}.jpg"
-            cv2.imwrite(os.path.join(OUTPUT_FOLDER, new_name), resized)
-            image_count += 1
-    except Exception:
-        continue
+        for entry in duplicates:
+            manifest.write(json.dumps(entry) + "\n")
+    elapsed = time.perf_counter() - start
+    index.save(PHASH_INDEX_PATH)
+    catalog.close()
 
-print(f"\n✅ Done! Cleaned and saved {image_count} total images to '{OUTPUT_FOLDER}'.")
+    processed = stats["saved"] + stats["error"] + sum(rejected.values())
+    print(f"\n✅ Done! Saved {stats['saved']} new images to '{OUTPUT_FOLDER}'.")
+    print(f"📊 Processed {processed} files in {elapsed:.1f} s ({processed / max(elapsed, 1e-9):.1f} files/s, {WORKERS} workers)")
+    print(f"   Rejected: {sum(rejected.values())} {rejected} | errors: {stats['error']}")
+    print(f"   Skipped (already in manifest): {stats['skipped']} | duplicates by content: {stats['duplicate']}")
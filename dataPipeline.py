@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+import tensorflow as tf
+
+from preprocess import IMAGE_SIZE, SCALE, load_rgb
+
+# ==== CONFIG ====
+AUTOTUNE = tf.data.AUTOTUNE
+SHUFFLE_BUFFER = 2048
+SEED = 0
+
+
+# ==== DECODE ====
+# Decoding goes through preprocess.load_rgb (cv2 releases the GIL), so the
+# tf.data path feeds the model exactly what every inference path sees.
+def _decode(path):
+    rgb = load_rgb(path.decode() if isinstance(path, bytes) else str(path))
+    if rgb is None:
+        return np.zeros((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+    return rgb
+
+
+def _decode_tensor(path, label):
+    image = tf.numpy_function(_decode, [path], tf.uint8)
+    image.set_shape((IMAGE_SIZE, IMAGE_SIZE, 3))
+    return image, label
+
+
+# ==== AUGMENTATION ====
+# Same ranges as the ImageDataGenerator in train.py, applied to a whole
+# batch at once.
+def make_augmenter(rotation_range, zoom_range, width_shift_range, height_shift_range,
+                   brightness_range):
+    spatial = tf.keras.Sequential([
+        tf.keras.layers.RandomRotation(rotation_range / 360.0, fill_mode="nearest", seed=SEED),
+        tf.keras.layers.RandomZoom((-zoom_range, zoom_range), fill_mode="nearest", seed=SEED),
+        tf.keras.layers.RandomTranslation(height_shift_range, width_shift_range,
+                                          fill_mode="nearest", seed=SEED),
+    ])
+    low, high = brightness_range
+
+    def augment(images, labels):
+        images = spatial(tf.cast(images, tf.float32), training=True)
+        # ImageDataGenerator's brightness_range is a multiplicative factor
+        factor = tf.random.uniform((tf.shape(images)[0], 1, 1, 1), low, high)
+        images = tf.clip_by_value(images * factor, 0.0, 255.0)
+        return images, labels
+
+    return augment
+
+
+def _rescale(images, labels):
+    return tf.cast(images, tf.float32) * SCALE, labels
+
+
+# ==== DATASETS ====
+def make_dataset(samples, batch_size, augment=None, training=True, cache=True):
+    paths = [path for path, _ in samples]
+    labels = np.array([label for _, label in samples], dtype=np.float32)
+
+    ds = tf.data.Dataset.from_tensor_slices((paths, labels))
+    if training:
+        # Shuffling file names first keeps the read order random from the
+        # very first epoch, before the cache exists.
+        ds = ds.shuffle(len(paths), seed=SEED, reshuffle_each_iteration=False)
+    ds = ds.map(_decode_tensor, num_parallel_calls=AUTOTUNE, deterministic=False)
+    if cache:
+        ds = ds.cache()  # decoded uint8, ~48 KB per image
+    if training:
+        ds = ds.shuffle(min(SHUFFLE_BUFFER, len(paths)), seed=SEED)
+    ds = ds.batch(batch_size, num_parallel_calls=AUTOTUNE)
+    if augment is not None:
+        ds = ds.map(augment, num_parallel_calls=AUTOTUNE)
+    ds = ds.map(_rescale, num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE)
+
+
+def steps_per_epoch(samples, batch_size):
+    return math.ceil(len(samples) / batch_size)
+
+
+# ==== PACKED SHARDS ====
+# Same batching/augmentation as make_dataset, but samples come straight
+# out of the memory-mapped shards from shards.py: no decode, no cache needed.
+def make_shard_dataset(shards, indices, batch_size, augment=None, training=True):
+    labels = tf.constant(shards.labels)
+
+    def gather(idx):
+        images = tf.numpy_function(shards.gather, [idx], tf.uint8)
+        images.set_shape((None, IMAGE_SIZE, IMAGE_SIZE, 3))
+        return images, tf.gather(labels, idx)
+
+    ds = tf.data.Dataset.from_tensor_slices(np.asarray(indices, dtype=np.int64))
+    if training:
+        ds = ds.shuffle(len(indices), seed=SEED)
+    ds = ds.batch(batch_size).map(gather, num_parallel_calls=AUTOTUNE)
+    if augment is not None:
+        ds = ds.map(augment, num_parallel_calls=AUTOTUNE)
+    ds = ds.map(_rescale, num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE)
@@ -0,0 +1,90 @@
+import os
+import random
+
+import numpy as np
+
+from catalog import CATALOG_PATH, Catalog
+from preprocess import IMAGE_SIZE, load_rgb, to_float
+
+# ==== CONFIG ====
+DATA_DIR = "dataset1"
+VALID_EXTS = ['.jpg', '.jpeg', '.png']
+VALIDATION_SPLIT = 0.1
+
+# Sorted folder order, the same class indices flow_from_directory assigned,
+# so the sigmoid output of the trained CNN is P(no_hand).
+CLASS_NAMES = ["hand", "no_hand"]
+
+
+def list_images(data_dir=DATA_DIR):
+    # The ingest scripts record every file they write in the catalog, so once
+    # it covers data_dir (`python catalog.py sync` backfills older files) the
+    # listing is one indexed query instead of a scan of each class folder.
+    if os.path.exists(CATALOG_PATH):
+        catalog = Catalog()
+        try:
+            if catalog.count(directory=data_dir):
+                return catalog.samples(data_dir, CLASS_NAMES, VALID_EXTS)
+        finally:
+            catalog.close()
+    samples = []
+    for label, class_name in enumerate(CLASS_NAMES):
+        class_dir = os.path.join(data_dir, class_name)
+        if not os.path.isdir(class_dir):
+            continue
+        for filename in sorted(os.listdir(class_dir)):
+            if os.path.splitext(filename)[1].lower() in VALID_EXTS:
+                samples.append((os.path.join(class_dir, filename), label))
+    return samples
+
+
+def sample_images(data_dir=DATA_DIR, limit=None, seed=0):
+    samples = list_images(data_dir)
+    random.Random(seed).shuffle(samples)
+    if limit is not None:
+        samples = samples[:limit]
+    return samples
+
+
+def split_samples(data_dir=DATA_DIR, val_fraction=VALIDATION_SPLIT, dedupe=False):
+    samples = sample_images(data_dir)
+    if dedupe:
+        # Near-duplicate clusters stay on one side of the split
+        from dedupe import PHashIndex, group_split, update_index
+        index = PHashIndex.load()
+        update_index(index, [path for path, _ in samples])
+        index.save()
+        return group_split(samples, index, val_fraction)
+    # Shuffled so both subsets see both classes; the first val_fraction
+    # goes to validation.
+    n_val = int(len(samples) * val_fraction)
+    return samples[n_val:], samples[:n_val]
+
+
+def load_image(path, out=None):
+    rgb = load_rgb(path)
+    if rgb is None:
+        return None
+    return to_float(rgb, out)
+
+
+def load_from_shards(samples):
+    # The packed copies from shards.py when every sample is in them, else None
+    from shards import open_shards
+    shards = open_shards()
+    return shards.load_paths(samples) if shards is not None else None
+
+
+def load_samples(data_dir=DATA_DIR, limit=None, seed=0):
+    samples = sample_images(data_dir, limit, seed)
+    loaded = load_from_shards(samples)
+    if loaded is not None:
+        return loaded
+    x = np.empty((len(samples), IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.float32)
+    y = np.empty(len(samples), dtype=np.int32)
+    kept = 0
+    for path, label in samples:
+        if load_image(path, out=x[kept]) is not None:
+            y[kept] = label
+            kept += 1
+    return x[:kept], y[:kept]
@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import cv2
+import numpy as np
+
+from dataset import DATA_DIR, list_images
+
+# ==== CONFIG ====
+INDEX_PATH = "phash_index.json"
+MAX_DISTANCE = 4   # Hamming distance (of 64 bits) treated as a near-duplicate
+HASH_SIZE = 8      # dHash on a 9x8 grey thumbnail -> 64 bits
+WORKERS = os.cpu_count() or 1
+
+
+# ==== DHASH ====
+def dhash(img):
+    small = cv2.resize(img, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def dhash_file(path):
+    # The reduced-size JPEG decode skips most of the IDCT work; dHash only
+    # looks at a 9x8 thumbnail anyway.
+    img = cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if img is None or min(img.shape[:2]) < HASH_SIZE + 1:
+        img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    return None if img is None else dhash(img)
+
+
+# int.bit_count() is 3.10+; the string count is the fallback
+popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+
+def _hash_task(path):
+    return path, dhash_file(path)
+
+
+# ==== MULTI-INDEX HASHING ====
+# The 64-bit hash is cut into max_distance + 1 pieces. Two hashes within
+# max_distance must then agree exactly on at least one piece (pigeonhole),
+# so a lookup only verifies hashes that share a piece instead of scanning
+# the whole corpus. The fewest pieces means the widest ones: at distance 4,
+# five pieces of 12-13 bits, so a bucket holds ~N/8192 hashes.
+class PHashIndex:
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.chunks = max_distance + 1
+        if self.chunks > 64:
+            raise ValueError(f"max_distance must be below 64, got {max_distance}")
+        # (shift, mask) per piece; the first 64 % chunks pieces get a spare bit
+        base, extra = divmod(64, self.chunks)
+        self.layout, shift = [], 0
+        for i in range(self.chunks):
+            bits = base + (i < extra)
+            self.layout.append((shift, (1 << bits) - 1))
+            shift += bits
+        self.tables = [{} for _ in range(self.chunks)]
+        self.hashes = {}   # path -> hash
+        self.stats = {}    # path -> (mtime, size)
+
+    def _pieces(self, h):
+        return [(h >> shift) & mask for shift, mask in self.layout]
+
+    def add(self, path, h, stat=None):
+        if path in self.hashes:
+            self.remove(path)
+        self.hashes[path] = h
+        if stat is not None:
+            self.stats[path] = (stat.st_mtime, stat.st_size)
+        for table, piece in zip(self.tables, self._pieces(h)):
+            table.setdefault(piece, []).append(path)
+
+    def remove(self, path):
+        h = self.hashes.pop(path)
+        self.stats.pop(path, None)
+        for table, piece in zip(self.tables, self._pieces(h)):
+            table[piece].remove(path)
+            if not table[piece]:
+                del table[piece]
+
+    def query(self, h, exclude=None):
+        candidates = set()
+        for table, piece in zip(self.tables, self._pieces(h)):
+            candidates.update(table.get(piece, ()))
+        candidates.discard(exclude)
+        hashes, limit = self.hashes, self.max_distance
+        matches = {}
+        for other in candidates:
+            distance = popcount(h ^ hashes[other])
+            if distance <= limit:
+                matches[other] = distance
+        return matches
+
+    def admit(self, path, h, stat=None):
+        # Ingest gate: indexes `path` unless it is a near-duplicate of an
+        # image already indexed. Returns the matches; empty means admitted.
+        matches = self.query(h, exclude=path)
+        if not matches:
+            self.add(path, h, stat)
+        return matches
+
+    def add_file(self, path):
+        # admit() for an image already on disk; None if it cannot be read
+        h = dhash_file(path)
+        if h is None:
+            return None
+        return self.admit(path, h, os.stat(path))
+
+    # ---- persistence ----
+    def save(self, path=INDEX_PATH):
+        data = {"max_distance": self.max_distance,
+                "entries": {p: [format(h, "016x"), *self.stats.get(p, (0, 0))] for p, h in self.hashes.items()}}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, max_distance=MAX_DISTANCE):
+        index = cls(max_distance)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            for p, (h, mtime, size) in data["entries"].items():
+                index.add(p, int(h, 16))
+                index.stats[p] = (mtime, size)
+        return index
+
+
+def update_index(index, paths, workers=WORKERS):
+    # Hash only files that are new or changed since the last save
+    todo = []
+    for path in paths:
+        stat = os.stat(path)
+        if index.stats.get(path) != (stat.st_mtime, stat.st_size):
+            todo.append(path)
+    for stale in set(index.hashes) - set(paths):
+        index.remove(stale)
+
+    if workers > 1 and len(todo) > 1:
+        with Pool(workers) as pool:
+            results = list(pool.imap_unordered(_hash_task, todo, chunksize=64))
+    else:
+        results = map(_hash_task, todo)
+    for path, h in results:
+        if h is not None:
+            index.add(path, h, os.stat(path))
+    return len(todo)
+
+
+# ==== CLUSTERS AND SPLITS ====
+def find_clusters(index):
+    parent = {p: p for p in index.hashes}
+
+    def root(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    for path, h in index.hashes.items():
+        for other in index.query(h, exclude=path):
+            a, b = root(path), root(other)
+            if a != b:
+                parent[a] = b
+
+    clusters = {}
+    for p in index.hashes:
+        clusters.setdefault(root(p), []).append(p)
+    return [sorted(members) for members in clusters.values()]
+
+
+def group_split(samples, index, val_fraction, seed=0):
+    # Whole near-duplicate clusters go to one side, so no image in val has
+    # a near-copy in train.
+    cluster_of = {}
+    for cluster in find_clusters(index):
+        for p in cluster:
+            cluster_of[p] = cluster[0]
+
+    groups = {}
+    for sample in samples:
+        groups.setdefault(cluster_of.get(sample[0], sample[0]), []).append(sample)
+    keys = sorted(groups)
+    random.Random(seed).shuffle(keys)
+
+    train, val = [], []
+    target = int(len(samples) * val_fraction)
+    for key in keys:
+        (val if len(val) < target else train).extend(groups[key])
+    return train, val
+
+
+# ==== BENCHMARK ====
+# Synthetic corpus: random 64-bit hashes plus one planted near-copy (1 to
+# max_distance bits flipped) per `dup_every` images, so the cost of the
+# index build and of a full clustering pass can be measured without images.
+def benchmark(n=100_000, max_distance=MAX_DISTANCE, dup_every=10, seed=0):
+    rng = random.Random(seed)
+    hashes = {}
+    for i in range(n):
+        if i % dup_every == 1:
+            h = hashes[f"img{i - 1}"]
+            for bit in rng.sample(range(64), rng.randint(1, max_distance)):
+                h ^= 1 << bit
+        else:
+            h = rng.getrandbits(64)
+        hashes[f"img{i}"] = h
+
+    start = time.perf_counter()
+    index = PHashIndex(max_distance)
+    for path, h in hashes.items():
+        index.add(path, h)
+    built = time.perf_counter()
+    clusters = [c for c in find_clusters(index) if len(c) > 1]
+    done = time.perf_counter()
+
+    buckets = [len(paths) for table in index.tables for paths in table.values()]
+    planted = len(range(1, n, dup_every))
+    print(f"🧪 {n} hashes, {index.chunks} pieces, mean bucket {sum(buckets) / len(buckets):.1f}")
+    print(f"   build {built - start:.2f} s, all-pairs clustering {done - built:.2f} s "
+          f"({len(clusters)} clusters found, {planted} planted)")
+    return done - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find near-duplicate images with a perceptual-hash index")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--max-distance", type=int, default=MAX_DISTANCE)
+    parser.add_argument("--show", type=int, default=10, help="print this many duplicate clusters")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time the index on N synthetic hashes instead")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.max_distance)
+        raise SystemExit
+
+    start = time.perf_counter()
+    index = PHashIndex.load(INDEX_PATH, args.max_distance)
+    hashed = update_index(index, [path for path, _ in list_images(args.data_dir)])
+    index.save(INDEX_PATH)
+    hashed_at = time.perf_counter()
+
+    clusters = [c for c in find_clusters(index) if len(c) > 1]
+    elapsed = time.perf_counter() - hashed_at
+    redundant = sum(len(c) - 1 for c in clusters)
+    print(f"🔎 {len(index.hashes)} images indexed ({hashed} hashed now, {hashed_at - start:.1f} s)")
+    print(f"📊 {len(clusters)} near-duplicate clusters, {redundant} redundant images "
+          f"(distance <= {args.max_distance}, lookup {elapsed:.2f} s)")
+    for cluster in sorted(clusters, key=len, reverse=True)[:args.show]:
+        print(f"   {len(cluster)}x: {', '.join(cluster[:4])}{' ...' if len(cluster) > 4 else ''}")
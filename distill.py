@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models
+from tensorflow.keras.callbacks import EarlyStopping
+
+from dataset import DATA_DIR, VALIDATION_SPLIT, split_samples
+from predictor import MODEL_PATH, STUDENT_PATH, THRESHOLD, Predictor
+from preprocess import IMAGE_SIZE, SCALE, load_rgb_batch
+
+# ==== CONFIG ====
+EPOCHS = 10
+BATCH_SIZE = 32
+TEMPERATURE = 2.0    # softens the teacher's outputs so its confidence carries information
+ALPHA = 0.3          # weight of the hard labels; the rest goes to the teacher
+PRUNE_EPOCHS = 2
+LATENCY_RUNS = 100
+REPORT_PATH = "distill_report.json"
+
+
+# ==== STUDENT ====
+# Depthwise-separable convs and global average pooling instead of
+# Flatten -> Dense(128), which holds most of the teacher's parameters.
+def build_student(width=16):
+    model = models.Sequential([
+        layers.Input(shape=(IMAGE_SIZE, IMAGE_SIZE, 3)),
+        layers.Conv2D(width, (3, 3), strides=2, padding='same', activation='relu'),
+        layers.SeparableConv2D(width * 2, (3, 3), padding='same', activation='relu'),
+        layers.MaxPooling2D(),
+        layers.SeparableConv2D(width * 4, (3, 3), padding='same', activation='relu'),
+        layers.MaxPooling2D(),
+        layers.SeparableConv2D(width * 8, (3, 3), padding='same', activation='relu'),
+        layers.GlobalAveragePooling2D(),
+        layers.Dropout(0.2),
+        layers.Dense(1, activation='sigmoid')
+    ])
+    # Sigmoid output like the teacher, so every predictor backend can load it
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+
+# ==== DISTILLATION TARGETS ====
+# Binary cross-entropy is linear in its target, so
+#   ALPHA * BCE(label, s) + (1 - ALPHA) * BCE(teacher_T, s) == BCE(mixed, s)
+# and plain fit() on the mixed soft target trains against both. The teacher
+# runs inside the input pipeline on the same augmented batch the student sees.
+def soft_targets(teacher, temperature=TEMPERATURE, alpha=ALPHA):
+    def mix(images, labels):
+        p = tf.clip_by_value(teacher(images, training=False)[:, 0], 1e-6, 1 - 1e-6)
+        softened = tf.sigmoid(tf.math.log(p / (1 - p)) / temperature)
+        return images, alpha * labels + (1 - alpha) * softened
+    return mix
+
+
+# ==== MAGNITUDE PRUNING ====
+# Zeroes the smallest-magnitude kernel weights of every conv/dense layer and
+# keeps them at zero through a short fine-tune.
+def _prunable(model):
+    return [l for l in model.layers
+            if isinstance(l, (layers.Conv2D, layers.SeparableConv2D, layers.Dense))]
+
+
+def magnitude_masks(model, sparsity):
+    masks = []
+    for layer in _prunable(model):
+        weights = layer.get_weights()
+        layer_masks = []
+        for w in weights:
+            if w.ndim < 2:  # biases stay dense
+                layer_masks.append(None)
+                continue
+            cutoff = np.quantile(np.abs(w), sparsity)
+            layer_masks.append((np.abs(w) > cutoff).astype(w.dtype))
+        masks.append(layer_masks)
+    return masks
+
+
+class ApplyMasks(tf.keras.callbacks.Callback):
+    def __init__(self, masks):
+        super().__init__()
+        self.masks = masks
+
+    def apply(self):
+        for layer, layer_masks in zip(_prunable(self.model), self.masks):
+            layer.set_weights([w if m is None else w * m for w, m in zip(layer.get_weights(), layer_masks)])
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.apply()
+
+
+def prune(student, train_ds, val_ds, sparsity, epochs=PRUNE_EPOCHS):
+    masks = ApplyMasks(magnitude_masks(student, sparsity))
+    masks.set_model(student)
+    masks.apply()
+    student.fit(train_ds, validation_data=val_ds, epochs=epochs, callbacks=[masks])
+    return student
+
+
+# ==== MEASUREMENTS ====
+def count_flops(model):
+    # Multiply-adds x2 of the conv/dense layers; pooling and activations are
+    # negligible next to them.
+    flops = 0
+    for layer in model.layers:
+        if not isinstance(layer, (layers.Conv2D, layers.SeparableConv2D, layers.Dense)):
+            continue
+        out_shape = layer.output.shape
+        in_channels = layer.input.shape[-1]
+        if isinstance(layer, layers.Dense):
+            flops += 2 * in_channels * layer.units
+            continue
+        positions = out_shape[1] * out_shape[2]
+        kh, kw = layer.kernel_size
+        if isinstance(layer, layers.SeparableConv2D):
+            flops += 2 * positions * kh * kw * in_channels            # depthwise
+            flops += 2 * positions * in_channels * layer.filters      # pointwise
+        else:
+            flops += 2 * positions * kh * kw * in_channels * layer.filters
+    return flops
+
+
+def nonzero_params(model):
+    return int(sum(np.count_nonzero(w) for w in model.get_weights()))
+
+
+def benchmark(model_path, x, y, runs=LATENCY_RUNS):
+    model = tf.keras.models.load_model(model_path, compile=False)
+    predictor = Predictor(model_path, max_batch=64)
+    scores = np.concatenate([predictor.predict_array(x[i:i + 64]) for i in range(0, len(x), 64)])
+    times = []
+    for i in range(runs):
+        start = time.perf_counter()
+        predictor.predict_array(x[i % len(x):i % len(x) + 1])
+        times.append(time.perf_counter() - start)
+    return {
+        "model": os.path.basename(model_path),
+        "params": int(model.count_params()),
+        "nonzero_params": nonzero_params(model),
+        "mflops": round(count_flops(model) / 1e6, 2),
+        "size_kb": round(os.path.getsize(model_path) / 1024, 1),
+        "latency_ms": round(float(np.median(times)) * 1000, 3),
+        "accuracy": round(float(np.mean((scores > THRESHOLD) == y)), 4),
+    }
+
+
+def print_table(rows):
+    print(f"\n{'model':40} {'params':>10} {'nonzero':>10} {'MFLOPs':>9} {'size KB':>9} {'ms/img':>8} {'acc':>7}")
+    for r in rows:
+        print(f"{r['model']:40} {r['params']:>10,} {r['nonzero_params']:>10,} {r['mflops']:>9} "
+              f"{r['size_kb']:>9} {r['latency_ms']:>8.3f} {r['accuracy']:>7.4f}")
+
+
+# ==== WORKFLOW ====
+def distill(teacher_path=MODEL_PATH, student_path=STUDENT_PATH, data_dir=DATA_DIR, epochs=EPOCHS,
+            batch_size=BATCH_SIZE, width=16, temperature=TEMPERATURE, alpha=ALPHA, sparsity=0.0):
+    from dataPipeline import make_augmenter, make_dataset
+    from train import AUGMENTATION
+
+    teacher = tf.keras.models.load_model(teacher_path, compile=False)
+    teacher.trainable = False
+    train_samples, val_samples = split_samples(data_dir, VALIDATION_SPLIT)
+    train_ds = make_dataset(train_samples, batch_size, augment=make_augmenter(**AUGMENTATION))
+    train_ds = train_ds.map(soft_targets(teacher, temperature, alpha))
+    val_ds = make_dataset(val_samples, batch_size, training=False)
+
+    student = build_student(width)
+    start = time.perf_counter()
+    student.fit(
+        train_ds,
+        validation_data=val_ds,
+        epochs=epochs,
+        callbacks=[
+            EarlyStopping(monitor='val_loss', patience=2, restore_best_weights=True),
+        ]
+    )
+    if sparsity > 0:
+        prune(student, train_ds, val_ds, sparsity)
+    student.save(student_path)
+    print(f"✅ Student trained in {time.perf_counter() - start:.1f} s, saved as {student_path}")
+
+    # Teacher and student on the same held-out images
+    images, kept = load_rgb_batch([path for path, _ in val_samples])
+    x = images.astype(np.float32) * SCALE
+    y = np.array([val_samples[i][1] for i in kept])
+    rows = [benchmark(teacher_path, x, y), benchmark(student_path, x, y)]
+    print_table(rows)
+    with open(REPORT_PATH, "w") as f:
+        json.dump({"samples": len(x), "temperature": temperature, "alpha": alpha, "sparsity": sparsity,
+                   "models": rows}, f, indent=2)
+    print(f"📝 Report written to {REPORT_PATH}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distill the CNN into a small student model")
+    parser.add_argument("--teacher", default=MODEL_PATH)
+    parser.add_argument("--student", default=STUDENT_PATH)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--width", type=int, default=16, help="filters in the first conv; doubles per block")
+    parser.add_argument("--temperature", type=float, default=TEMPERATURE)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--sparsity", type=float, default=0.0,
+                        help="fraction of conv/dense weights to prune by magnitude (0 = no pruning)")
+    args = parser.parse_args()
+
+    distill(args.teacher, args.student, DATA_DIR, args.epochs, args.batch_size, args.width,
+            args.temperature, args.alpha, args.sparsity)
@@ -0,0 +1,201 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dataset import CLASS_NAMES, DATA_DIR, VALIDATION_SPLIT, list_images, load_from_shards, split_samples
+from metrics import git_commit, summarize
+from predictor import MODEL_PATH, THRESHOLD
+from preprocess import SCALE, load_rgb_batch
+
+# ==== CONFIG ====
+BATCH_SIZES = [1, 8, 32, 128]
+THREAD_COUNTS = sorted({1, 2, 4, os.cpu_count() or 1})
+THRESHOLDS = [round(t, 2) for t in np.arange(0.30, 0.71, 0.05)]
+BASELINE_PATH = "eval_baseline.json"
+REPORT_PATH = "eval_report.json"
+ACCURACY_TOLERANCE = 0.01    # absolute drop allowed against the baseline
+THROUGHPUT_TOLERANCE = 0.10  # relative images/sec drop allowed, per (threads, batch) cell
+WARMUP_BATCHES = 2
+
+
+# ==== HELD-OUT SET ====
+def load_eval_set(data_dir=DATA_DIR, all_images=False):
+    # The validation half of train.py's split, unless every image is wanted
+    samples = list_images(data_dir) if all_images else split_samples(data_dir, VALIDATION_SPLIT)[1]
+    loaded = load_from_shards(samples)
+    if loaded is not None:
+        return loaded
+    images, kept = load_rgb_batch([path for path, _ in samples])
+    x = images.astype(np.float32) * SCALE
+    y = np.array([samples[i][1] for i in kept], dtype=np.int32)
+    return x, y
+
+
+# ==== MEASUREMENT (one fresh process per thread count) ====
+# TensorFlow fixes its thread pools when it initializes, so each thread
+# count gets its own spawned process with the limits set beforehand.
+def _limit_threads(threads, keras):
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TF_NUM_INTRAOP_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    if keras:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def measure(model_path, x_path, threads, batch_sizes):
+    from predictor import open_model
+
+    x = np.load(x_path, mmap_mode="r")
+    predictor = open_model(model_path, max_batch=max(batch_sizes), num_threads=threads)
+    results, scores = [], None
+    for batch_size in batch_sizes:
+        for _ in range(WARMUP_BATCHES):
+            predictor.predict_array(np.ascontiguousarray(x[:batch_size]))
+        out = np.empty(len(x), dtype=np.float32)
+        latencies = []
+        start = time.perf_counter()
+        for i in range(0, len(x), batch_size):
+            batch = np.ascontiguousarray(x[i:i + batch_size])
+            t0 = time.perf_counter()
+            out[i:i + len(batch)] = predictor.predict_array(batch)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+        results.append({"threads": threads, "batch_size": batch_size,
+                        "images_per_sec": round(len(x) / elapsed, 1),
+                        "batch_latency": summarize(latencies)})
+        if scores is None:
+            scores = out
+    return results, scores, predictor.backend
+
+
+# ==== ACCURACY ====
+def confusion(scores, y, threshold):
+    predicted = (scores > threshold).astype(np.int32)
+    matrix = np.zeros((2, 2), dtype=np.int64)  # rows: true class, columns: predicted
+    np.add.at(matrix, (y, predicted), 1)
+    return matrix
+
+
+def threshold_sweep(scores, y, thresholds=THRESHOLDS):
+    rows = []
+    for t in thresholds:
+        m = confusion(scores, y, t)
+        rows.append({"threshold": t,
+                     "accuracy": round(float(np.trace(m) / m.sum()), 4),
+                     f"{CLASS_NAMES[0]}_recall": round(float(m[0, 0] / max(m[0].sum(), 1)), 4),
+                     f"{CLASS_NAMES[1]}_recall": round(float(m[1, 1] / max(m[1].sum(), 1)), 4)})
+    return rows
+
+
+# ==== REGRESSION GATES ====
+def check_baseline(report, baseline, accuracy_tol=ACCURACY_TOLERANCE, throughput_tol=THROUGHPUT_TOLERANCE):
+    failures = []
+    drop = baseline["accuracy"] - report["accuracy"]
+    if drop > accuracy_tol:
+        failures.append(f"accuracy {report['accuracy']:.4f} vs baseline {baseline['accuracy']:.4f} "
+                        f"(-{drop:.4f} > {accuracy_tol})")
+    before = {(r["threads"], r["batch_size"]): r["images_per_sec"] for r in baseline["throughput"]}
+    for r in report["throughput"]:
+        old = before.get((r["threads"], r["batch_size"]))
+        if old and r["images_per_sec"] < old * (1 - throughput_tol):
+            failures.append(f"{r['threads']} threads / batch {r['batch_size']}: {r['images_per_sec']} img/s "
+                            f"vs baseline {old} (-{1 - r['images_per_sec'] / old:.0%} > {throughput_tol:.0%})")
+    return failures
+
+
+# ==== SUITE ====
+def run_suite(model_path=MODEL_PATH, data_dir=DATA_DIR, batch_sizes=BATCH_SIZES, thread_counts=THREAD_COUNTS,
+              all_images=False):
+    x, y = load_eval_set(data_dir, all_images)
+    keras = not model_path.endswith((".tflite", ".onnx"))
+    context = multiprocessing.get_context("spawn")
+
+    throughput, scores, backend = [], None, None
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path = os.path.join(tmp, "x.npy")
+        np.save(x_path, x)
+        for threads in thread_counts:
+            # One process at a time so runs never compete for cores
+            with ProcessPoolExecutor(1, mp_context=context, initializer=_limit_threads,
+                                     initargs=(threads, keras)) as pool:
+                results, run_scores, backend = pool.submit(measure, model_path, x_path, threads, batch_sizes).result()
+            throughput.extend(results)
+            scores = run_scores if scores is None else scores
+            for r in results:
+                print(f"⏱️ {threads:>2} threads, batch {r['batch_size']:>4}: {r['images_per_sec']:>9.1f} img/s, "
+                      f"batch p50 {r['batch_latency']['p50_ms']:.2f} ms, p95 {r['batch_latency']['p95_ms']:.2f} ms")
+
+    matrix = confusion(scores, y, THRESHOLD)
+    return {
+        "model": model_path,
+        "backend": backend,
+        "commit": git_commit(),
+        "samples": len(y),
+        "threshold": THRESHOLD,
+        "accuracy": round(float(np.trace(matrix) / matrix.sum()), 4),
+        "confusion": {"labels": CLASS_NAMES, "matrix": matrix.tolist()},
+        "thresholds": threshold_sweep(scores, y),
+        "throughput": throughput,
+    }
+
+
+def print_summary(report):
+    m = report["confusion"]["matrix"]
+    names = report["confusion"]["labels"]
+    print(f"\n📊 {report['model']} ({report['backend']}) on {report['samples']} held-out images: "
+          f"accuracy {report['accuracy']:.4f} at threshold {report['threshold']}")
+    corner = "true \\ predicted"
+    print(f"{corner:>18} {names[0]:>9} {names[1]:>9}")
+    for name, row in zip(names, m):
+        print(f"{name:>18} {row[0]:>9} {row[1]:>9}")
+    print(f"\n{'threshold':>9} {'accuracy':>9} " + " ".join(f"{n + ' recall':>15}" for n in names))
+    for r in report["thresholds"]:
+        print(f"{r['threshold']:>9.2f} {r['accuracy']:>9.4f} "
+              + " ".join(f"{r[n + '_recall']:>15.4f}" for n in names))
+    best = max(report["throughput"], key=lambda r: r["images_per_sec"])
+    print(f"\n🚀 Best throughput: {best['images_per_sec']} img/s "
+          f"({best['threads']} threads, batch {best['batch_size']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline accuracy / throughput evaluation with regression gates")
+    parser.add_argument("--model", default=MODEL_PATH, help=".h5, .tflite or .onnx")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--threads", type=int, nargs="+", default=THREAD_COUNTS)
+    parser.add_argument("--all", action="store_true", help="evaluate every image in dataset1, not just the held-out split")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--accuracy-tolerance", type=float, default=ACCURACY_TOLERANCE)
+    parser.add_argument("--throughput-tolerance", type=float, default=THROUGHPUT_TOLERANCE)
+    args = parser.parse_args()
+
+    report = run_suite(args.model, DATA_DIR, args.batch_sizes, args.threads, args.all)
+    print_summary(report)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Report written to {REPORT_PATH}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            failures = check_baseline(report, json.load(f), args.accuracy_tolerance, args.throughput_tolerance)
+        if failures:
+            print("❌ Regression against the baseline:")
+            for failure in failures:
+                print(f"   {failure}")
+            sys.exit(1)
+        print("✅ Within tolerance of the baseline")
+    else:
+        print(f"ℹ️ No baseline at {args.baseline}; run with --save-baseline to create one")
@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, models
+from tensorflow.keras.callbacks import EarlyStopping
+
+from dataClean import file_hash
+from dataset import DATA_DIR, VALIDATION_SPLIT, split_samples
+from preprocess import SCALE, load_rgb_batch
+
+# ==== CONFIG ====
+MODEL_PATH = "cnn1_hand_vs_nohand_final.h5"
+FEATURE_DIR = "feature_cache"
+INDEX_NAME = "index.json"
+CHUNK = 512              # images decoded and pushed through the trunk per step
+DTYPE = np.float16       # 25088 features per image -> ~49 KB instead of ~98 KB
+HEAD_EPOCHS = 20
+HEAD_BATCH = 64
+
+
+# ==== TRUNK / HEAD ====
+# The trunk is everything up to and including Flatten; the head is the
+# Dense(128)/Dropout/Dense(1) stack after it.
+def split_model(model):
+    flatten = next(i for i, layer in enumerate(model.layers) if isinstance(layer, layers.Flatten))
+    trunk = tf.keras.Model(model.inputs, model.layers[flatten].output)
+    return trunk, model.layers[flatten + 1:]
+
+
+def trunk_fingerprint(trunk):
+    # Changes whenever any trunk weight changes, which invalidates the cache
+    h = hashlib.sha1()
+    for w in trunk.get_weights():
+        h.update(str(w.shape).encode())
+        h.update(np.ascontiguousarray(w).tobytes())
+    return h.hexdigest()[:16]
+
+
+def build_head(input_dim, units=128, dropout=0.3, learning_rate=1e-3):
+    head = models.Sequential([
+        layers.Input(shape=(input_dim,)),
+        layers.Dense(units, activation='relu'),
+        layers.Dropout(dropout),
+        layers.Dense(1, activation='sigmoid')
+    ])
+    head.compile(optimizer=tf.keras.optimizers.Adam(learning_rate),
+                 loss='binary_crossentropy',
+                 metrics=['accuracy'])
+    return head
+
+
+def attach_head(model, head):
+    # Copies trained head weights into the full model; widths must match
+    _, model_head = split_model(model)
+    for target, source in zip([l for l in model_head if l.weights], [l for l in head.layers if l.weights]):
+        target.set_weights(source.get_weights())
+    return model
+
+
+# ==== STORE ====
+# feature_cache/<fingerprint>/chunk_00000.npy   DTYPE (N, dim), append-only
+# feature_cache/<fingerprint>/index.json        {"dim", "chunks", "rows": {image hash: [chunk, row]},
+#                                                "files": {path: [mtime, size, image hash]}}
+# Rows are keyed by image content, so renamed or copied files reuse their
+# features; "files" only saves re-hashing unchanged paths.
+class FeatureStore:
+    def __init__(self, trunk, root=FEATURE_DIR):
+        self.trunk = trunk
+        self.fingerprint = trunk_fingerprint(trunk)
+        self.root = root
+        self.dir = os.path.join(root, self.fingerprint)
+        os.makedirs(self.dir, exist_ok=True)
+        try:
+            with open(os.path.join(self.dir, INDEX_NAME), "r") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {"dim": int(np.prod(trunk.output_shape[1:])), "chunks": [], "rows": {}, "files": {}}
+        self._chunks = {}
+
+    def prune(self):
+        # Drops caches built by earlier trunk weights
+        for name in os.listdir(self.root):
+            if name != self.fingerprint:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def _save(self):
+        path = os.path.join(self.dir, INDEX_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.index, f)
+        os.replace(path + ".tmp", path)
+
+    def hash_of(self, path):
+        stat = os.stat(path)
+        known = self.index["files"].get(path)
+        if known and known[0] == stat.st_mtime and known[1] == stat.st_size:
+            return known[2]
+        digest = file_hash(path)
+        self.index["files"][path] = [stat.st_mtime, stat.st_size, digest]
+        return digest
+
+    def update(self, paths):
+        # Runs the trunk only over images whose content is not cached yet
+        todo, queued = [], set()
+        for path in paths:
+            digest = self.hash_of(path)
+            if digest not in self.index["rows"] and digest not in queued:
+                queued.add(digest)
+                todo.append((path, digest))
+
+        for start in range(0, len(todo), CHUNK):
+            batch = todo[start:start + CHUNK]
+            images, kept = load_rgb_batch([path for path, _ in batch])
+            if not kept:
+                continue
+            feats = self.trunk.predict(images.astype(np.float32) * SCALE, batch_size=HEAD_BATCH, verbose=0)
+            chunk_id = len(self.index["chunks"])
+            filename = f"chunk_{chunk_id:05d}.npy"
+            np.save(os.path.join(self.dir, filename), feats.reshape(len(kept), -1).astype(DTYPE))
+            self.index["chunks"].append(filename)
+            for row, i in enumerate(kept):
+                self.index["rows"][batch[i][1]] = [chunk_id, row]
+            self._save()  # an interrupted build keeps every finished chunk
+        self._save()
+        return len(todo)
+
+    def _chunk(self, chunk_id):
+        if chunk_id not in self._chunks:
+            self._chunks[chunk_id] = np.load(os.path.join(self.dir, self.index["chunks"][chunk_id]), mmap_mode="r")
+        return self._chunks[chunk_id]
+
+    def locate(self, samples):
+        # [(chunk, row, label)] for the samples whose image is cached, in
+        # on-disk order
+        rows = []
+        for path, label in samples:
+            known = self.index["files"].get(path)
+            loc = self.index["rows"].get(known[2]) if known else None
+            if loc is not None:
+                rows.append((loc[0], loc[1], label))
+        return sorted(rows)
+
+    def batches(self, samples, batch_size=HEAD_BATCH, shuffle=False, rng=None):
+        # Yields (x, y) straight from the memory-mapped chunks, so only one
+        # batch of features is ever in RAM. Shuffling permutes the chunk
+        # order and the rows within each chunk, which keeps reads local.
+        rows = self.locate(samples)
+        if shuffle:
+            rng = rng or np.random.default_rng()
+            by_chunk = {}
+            for chunk_id, row, label in rows:
+                by_chunk.setdefault(chunk_id, []).append((chunk_id, row, label))
+            rows = []
+            for chunk_id in rng.permutation(sorted(by_chunk)):
+                group = by_chunk[chunk_id]
+                rows.extend(group[i] for i in rng.permutation(len(group)))
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            parts, i = [], 0
+            while i < len(batch):
+                chunk_id, j = batch[i][0], i
+                while j < len(batch) and batch[j][0] == chunk_id:
+                    j += 1
+                parts.append(self._chunk(chunk_id)[[row for _, row, _ in batch[i:j]]])
+                i = j
+            yield np.concatenate(parts), np.array([label for _, _, label in batch], dtype=np.float32)
+
+    def dataset(self, samples, batch_size=HEAD_BATCH, shuffle=False, seed=None):
+        # tf.data view over batches(); a shuffled dataset draws a new order
+        # every epoch
+        rng = np.random.default_rng(seed)
+        spec = (tf.TensorSpec((None, self.index["dim"]), tf.as_dtype(DTYPE)),
+                tf.TensorSpec((None,), tf.float32))
+        ds = tf.data.Dataset.from_generator(lambda: self.batches(samples, batch_size, shuffle, rng),
+                                            output_signature=spec)
+        return ds.map(lambda x, y: (tf.cast(x, tf.float32), y)).prefetch(tf.data.AUTOTUNE)
+
+
+def open_store(model_path=MODEL_PATH, data_dir=DATA_DIR, dedupe=False):
+    model = tf.keras.models.load_model(model_path)
+    trunk, _ = split_model(model)
+    store = FeatureStore(trunk)
+    store.prune()
+    train_samples, val_samples = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    start = time.perf_counter()
+    computed = store.update([path for path, _ in train_samples + val_samples])
+    print(f"🧊 Feature cache {store.fingerprint}: {computed} images run through the trunk "
+          f"({time.perf_counter() - start:.1f} s), {len(store.index['rows'])} cached")
+    return model, store, train_samples, val_samples
+
+
+# ==== HEAD TRAINING ====
+def train_head(model_path=MODEL_PATH, data_dir=DATA_DIR, epochs=HEAD_EPOCHS, batch_size=HEAD_BATCH,
+               units=128, dropout=0.3, learning_rate=1e-3, output_path=None, dedupe=False):
+    # No augmentation here: the cached features are of the stored images.
+    model, store, train_samples, val_samples = open_store(model_path, data_dir, dedupe)
+    train_ds = store.dataset(train_samples, batch_size, shuffle=True, seed=0)
+    val_ds = store.dataset(val_samples, batch_size)
+
+    start = time.perf_counter()
+    head = build_head(store.index["dim"], units, dropout, learning_rate)
+    head.fit(train_ds, validation_data=val_ds, epochs=epochs,
+             callbacks=[EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)],
+             verbose=2)
+    _, accuracy = head.evaluate(val_ds, verbose=0)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Head trained in {elapsed:.1f} s on {len(store.locate(train_samples))} cached samples: "
+          f"val accuracy {accuracy:.4f}")
+
+    if output_path:
+        if units == 128:
+            attach_head(model, head).save(output_path)
+        else:
+            # A different width needs a new full model around the same trunk
+            trunk, _ = split_model(model)
+            full = models.Sequential([trunk, *head.layers])
+            full.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+            full.save(output_path)
+        print(f"💾 Saved {output_path}")
+    return head, accuracy, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrain the dense head on cached conv features")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--output", help="save the model with the new head here")
+    parser.add_argument("--epochs", type=int, default=HEAD_EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=HEAD_BATCH)
+    parser.add_argument("--units", type=int, default=128)
+    parser.add_argument("--dropout", type=float, default=0.3)
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--dedupe-split", action="store_true")
+    parser.add_argument("--build-only", action="store_true", help="only bring the feature cache up to date")
+    args = parser.parse_args()
+
+    if args.build_only:
+        open_store(args.model, DATA_DIR, args.dedupe_split)
+    else:
+        train_head(args.model, DATA_DIR, args.epochs, args.batch_size, args.units, args.dropout,
+                   args.learning_rate, args.output, args.dedupe_split)
@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import random
+import time
+
+import tensorflow as tf
+from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+
+from dataset import DATA_DIR, VALIDATION_SPLIT, split_samples
+
+# ==== CONFIG ====
+MODEL_PATH = "cnn1_hand_vs_nohand_final.h5"
+EPOCHS = 3
+BATCH_SIZE = 32
+LEARNING_RATE = 1e-4   # well below Adam's default, so the warm start is not thrown away
+REPLAY_RATIO = 1.0     # old samples replayed per new sample, against forgetting
+MIN_REPLAY = 256
+TOLERANCE = 0.01       # accepted accuracy gap to a full retrain (--compare-full)
+
+
+# ==== SEEN-SAMPLES LEDGER ====
+# Stored next to each checkpoint: every training sample the weights have
+# been fitted on, with the (mtime, size) it had at the time, plus one entry
+# per run. A file whose stat changed counts as new again.
+def ledger_path(model_path):
+    return os.path.splitext(model_path)[0] + ".samples.json"
+
+
+def load_ledger(model_path):
+    path = ledger_path(model_path)
+    if not os.path.exists(path):
+        return {"samples": {}, "runs": []}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_ledger(model_path, ledger):
+    path = ledger_path(model_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(ledger, f)
+    os.replace(tmp, path)
+
+
+def _stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime, stat.st_size]
+
+
+def record_run(model_path, samples, ledger=None, **run):
+    ledger = ledger or load_ledger(model_path)
+    for path, _ in samples:
+        ledger["samples"][path] = _stat(path)
+    ledger["runs"].append({"time": time.time(), "samples": len(samples), **run})
+    save_ledger(model_path, ledger)
+    return ledger
+
+
+def split_new(samples, ledger):
+    new, old = [], []
+    for sample in samples:
+        seen = ledger["samples"].get(sample[0])
+        (old if seen == _stat(sample[0]) else new).append(sample)
+    return new, old
+
+
+# ==== FINE-TUNE ====
+def load_for_finetune(model_path, freeze_conv=True, learning_rate=LEARNING_RATE):
+    model = tf.keras.models.load_model(model_path)
+    if freeze_conv:
+        # Only the dense head adapts; the conv trunk keeps its features
+        for layer in model.layers:
+            if isinstance(layer, tf.keras.layers.Conv2D):
+                layer.trainable = False
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate),
+                  loss='binary_crossentropy',
+                  metrics=['accuracy'])
+    return model
+
+
+def finetune(model_path=MODEL_PATH, data_dir=DATA_DIR, epochs=EPOCHS, batch_size=BATCH_SIZE,
+             freeze_conv=True, replay_ratio=REPLAY_RATIO, learning_rate=LEARNING_RATE,
+             output_path=None, dedupe=False):
+    # Trains on the new/changed training samples plus a random replay subset
+    # of the ones the checkpoint has already seen. Validation is the same
+    # held-out split a full retrain uses, so the two are comparable.
+    from dataPipeline import make_augmenter, make_dataset
+    from train import AUGMENTATION
+
+    output_path = output_path or model_path
+    ledger = load_ledger(model_path)
+    if not ledger["runs"]:
+        print(f"⚠️ No ledger for {model_path}; every sample counts as new this time")
+    train_samples, val_samples = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    new, old = split_new(train_samples, ledger)
+    if not new:
+        print(f"✅ {model_path} has already seen all {len(train_samples)} training samples")
+        return None
+
+    n_replay = min(len(old), max(MIN_REPLAY, int(len(new) * replay_ratio)))
+    replay = random.Random(len(ledger["runs"])).sample(old, n_replay)
+    print(f"🔁 Fine-tuning on {len(new)} new + {len(replay)} replayed samples "
+          f"({'conv frozen' if freeze_conv else 'all layers'})")
+
+    start = time.perf_counter()
+    model = load_for_finetune(model_path, freeze_conv, learning_rate)
+    train_ds = make_dataset(new + replay, batch_size, augment=make_augmenter(**AUGMENTATION))
+    val_ds = make_dataset(val_samples, batch_size, training=False)
+    _, before = model.evaluate(val_ds, verbose=0)
+
+    model.fit(
+        train_ds,
+        validation_data=val_ds,
+        epochs=epochs,
+        callbacks=[
+            EarlyStopping(monitor='val_loss', patience=1, restore_best_weights=True),
+            ModelCheckpoint(output_path, monitor="val_loss", save_best_only=True, verbose=1),
+        ]
+    )
+    _, after = model.evaluate(val_ds, verbose=0)
+    elapsed = time.perf_counter() - start
+
+    if output_path != model_path:
+        ledger = {"samples": dict(ledger["samples"]), "runs": list(ledger["runs"])}
+    record_run(output_path, new + replay, ledger, mode="finetune", new=len(new), replay=len(replay),
+               freeze_conv=freeze_conv, seconds=round(elapsed, 1), val_accuracy=float(after))
+    print(f"✅ Fine-tuned in {elapsed:.1f} s: val accuracy {before:.4f} -> {after:.4f}, saved {output_path}")
+    return {"seconds": elapsed, "val_accuracy": float(after), "before": float(before)}
+
+
+def compare_full(model_path=MODEL_PATH, data_dir=DATA_DIR, **kwargs):
+    # Fine-tunes and fully retrains into side files, then checks the
+    # fine-tuned accuracy is within TOLERANCE of the retrain.
+    from train import train
+
+    base, ext = os.path.splitext(model_path)
+    tuned = finetune(model_path, data_dir, output_path=f"{base}_finetuned{ext}", **kwargs)
+    if tuned is None:
+        return
+    start = time.perf_counter()
+    full_path = f"{base}_full{ext}"
+    # Same split and batch size as the fine-tune, so both are scored on
+    # images neither trained on
+    dedupe = kwargs.get("dedupe", False)
+    batch_size = kwargs.get("batch_size", BATCH_SIZE)
+    model = train("tfdata", data_dir, batch_size=batch_size, model_path=full_path, dedupe=dedupe)
+    full_seconds = time.perf_counter() - start
+    _, val_samples = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    from dataPipeline import make_dataset
+    _, full_acc = model.evaluate(make_dataset(val_samples, batch_size, training=False), verbose=0)
+
+    gap = full_acc - tuned["val_accuracy"]
+    print(f"📊 fine-tune {tuned['val_accuracy']:.4f} in {tuned['seconds']:.1f} s | "
+          f"full retrain {full_acc:.4f} in {full_seconds:.1f} s "
+          f"({tuned['seconds'] / max(full_seconds, 1e-9):.0%} of the time)")
+    print(f"{'✅' if gap <= TOLERANCE else '❌'} accuracy gap {gap:+.4f} (tolerance {TOLERANCE})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm-start fine-tuning of the hand / no-hand CNN")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--output", help="write the fine-tuned model here instead of over --model")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--unfreeze", action="store_true", help="also train the conv blocks")
+    parser.add_argument("--replay-ratio", type=float, default=REPLAY_RATIO)
+    parser.add_argument("--learning-rate", type=float, default=LEARNING_RATE)
+    parser.add_argument("--dedupe-split", action="store_true")
+    parser.add_argument("--compare-full", action="store_true",
+                        help="also run a full retrain and compare accuracy and wall time")
+    args = parser.parse_args()
+
+    options = dict(epochs=args.epochs, batch_size=args.batch_size, freeze_conv=not args.unfreeze,
+                   replay_ratio=args.replay_ratio, learning_rate=args.learning_rate,
+                   dedupe=args.dedupe_split)
+    if args.compare_full:
+        compare_full(args.model, DATA_DIR, **options)
+    else:
+        finetune(args.model, DATA_DIR, output_path=args.output, **options)
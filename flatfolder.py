@@ -1,39 +1,142 @@
+import argparse
+import hashlib
 import os
-import shutil
+import tarfile
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from catalog import Catalog
+from dedupe import PHashIndex, dhash
 
 # === CONFIGURATION ===
 ZIP_PATH = r"C:\Users\genui\Downloads\Nohands4.zip"
-EXTRACT_DIR = "temp_extracted"
 DEST_DIR = "flat_folder2"
 VALID_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+PREFIX = "hand_"
+INDEX_NAME = "phash_index.json"  # near-duplicate index kept inside the destination folder
+WORKERS = os.cpu_count() or 1
+IN_FLIGHT_PER_WORKER = 4  # members read but not yet written, per worker; bounds memory
+
+
+# === ARCHIVE MEMBERS ===
+# Yields (name, bytes) one member at a time straight from the archive, so
+# nothing is ever extracted to a temp folder.
+def iter_members(archive_path):
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    yield info.filename, zf.read(info)
+    elif tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path, 'r:*') as tf:  # streams .tar/.tar.gz/.tar.bz2/.tar.xz
+            for member in tf:
+                if member.isfile():
+                    yield member.name, tf.extractfile(member).read()
+    else:
+        raise ValueError(f"Unsupported archive: {archive_path}")
+
+
+# === DECODE / VALIDATE / WRITE (worker threads) ===
+# Output names come from the catalog counter (catalog.py), so the
+# destination folder is never listed or probed.
+def decode_member(data, ext):
+    # (width, height, dhash), or None if the member is not a readable image
+    if ext == '.gif':
+        # OpenCV cannot decode GIF; the logical screen size follows the magic.
+        # No hash, so GIFs are never rejected as near-duplicates.
+        if data[:6] not in (b"GIF87a", b"GIF89a") or len(data) < 10:
+            return None
+        return int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little"), None
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    return None if img is None else (img.shape[1], img.shape[0], dhash(img))
+
+
+def write_member(data, dst_path):
+    with open(dst_path, 'wb') as f:
+        f.write(data)
+
+
+def ingest(archive_path, dest_dir=DEST_DIR, workers=WORKERS, catalog=None, index=None,
+           skip_duplicates=False):
+    # With a PHashIndex, every written member is added to it; with
+    # skip_duplicates, members that near-duplicate an image already in the
+    # index (or an earlier member) are counted and not written.
+    os.makedirs(dest_dir, exist_ok=True)
+    catalog = catalog or Catalog()
+    source = f"flatfolder:{os.path.basename(archive_path)}"
+    slots = threading.BoundedSemaphore(IN_FLIGHT_PER_WORKER * workers)
+    stats = {"written": 0, "invalid": 0, "duplicate": 0, "failed": 0, "skipped": 0, "bytes": 0}
+    lock = threading.Lock()
+
+    def task(data, ext, dst_path):
+        try:
+            decoded = decode_member(data, ext)
+            if decoded is None:
+                outcome = "invalid"
+            else:
+                width, height, h = decoded
+                if index is not None and h is not None:
+                    with lock:
+                        near = index.admit(dst_path, h) if skip_duplicates else index.add(dst_path, h)
+                        if near:
+                            stats["duplicate"] += 1
+                    if near:
+                        return
+                write_member(data, dst_path)
+                catalog.add(dst_path, source=source, hash=hashlib.sha1(data).hexdigest(),
+                            width=width, height=height)
+                outcome = "written"
+            with lock:
+                stats[outcome] += 1
+                stats["bytes"] += len(data) if outcome == "written" else 0
+        except Exception as e:
+            # Disk, catalog (sqlite3) or decoder errors: nothing of this
+            # member is kept, and the other workers carry on
+            print(f"⚠️ Could not write {dst_path}: {type(e).__name__}: {e}")
+            with lock:
+                stats["failed"] += 1
+                if index is not None and dst_path in index.hashes:
+                    index.remove(dst_path)
+            try:
+                os.remove(dst_path)
+            except OSError:
+                pass
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        for name, data in iter_members(archive_path):
+            ext = os.path.splitext(name)[1].lower()
+            if ext not in VALID_EXTENSIONS:
+                stats["skipped"] += 1
+                continue
+            slots.acquire()  # blocks the reader instead of buffering the archive
+            pool.submit(task, data, ext, catalog.next_name(dest_dir, PREFIX, ext))
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy every image in a zip/tar archive into one flat folder")
+    parser.add_argument("archive", nargs="?", default=ZIP_PATH)
+    parser.add_argument("--dest", default=DEST_DIR)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--skip-duplicates", action="store_true",
+                        help="do not write images that near-duplicate one already in the destination")
+    args = parser.parse_args()
 
-# === EXTRACT ZIP ===
-with zipfile.ZipFile(ZIP_PATH, 'r') as zip_ref:
-    zip_ref.extractall(EXTRACT_DIR)
-
-# === SETUP DESTINATION FOLDER ===
-os.makedirs(DEST_DIR, exist_ok=True)
-
-# === GET EXISTING FILE COUNT ===
-existing_files = os.listdir(DEST_DIR)
-count = len(existing_files)
-
-# === WALK AND COLLECT IMAGES ===
-for root, dirs, files in os.walk(EXTRACT_DIR):
-    for file in files:
-        ext = os.path.splitext(file)[1].lower()
-        if ext in VALID_EXTENSIONS:
-            # Generate a unique filename like hand_00001.jpg
-            new_name = f"hand_{count:05}{ext}"
-            while new_name in existing_files:
-                count += 1
-                new_name = f"hand_{count:05}{ext}"
-
-            src_path = os.path.join(root, file)
-            dst_path = os.path.join(DEST_DIR, new_name)
-            shutil.copy2(src_path, dst_path)
-            existing_files.append(new_name)
-            count += 1
-
-print(f"✅ Finished copying. Total images now: {len(existing_files)}")
+    index_path = os.path.join(args.dest, INDEX_NAME)
+    index = PHashIndex.load(index_path)
+    stats = ingest(args.archive, args.dest, args.workers, index=index, skip_duplicates=args.skip_duplicates)
+    index.save(index_path)
+    elapsed = max(stats["elapsed"], 1e-9)
+    print(f"✅ Finished copying. Wrote {stats['written']} images to '{args.dest}' "
+          f"({stats['invalid']} corrupt, {stats['failed']} failed, {stats['duplicate']} near-duplicates, "
+          f"{stats['skipped']} non-image members skipped)")
+    print(f"📊 {stats['written'] / elapsed:.1f} files/s, {stats['bytes'] / elapsed / 1e6:.1f} MB/s")
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# ==== CONFIG ====
+STORE_PATH = "gestures.db"
+LEGACY_JSON = "gesture_data.json"
+DTYPE = np.float32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS gestures (
+    id         INTEGER PRIMARY KEY,
+    name       TEXT UNIQUE NOT NULL,
+    created_at REAL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    id            INTEGER PRIMARY KEY,
+    gesture_id    INTEGER NOT NULL REFERENCES gestures(id) ON DELETE CASCADE,
+    dim           INTEGER NOT NULL,
+    vector        BLOB NOT NULL,     -- raw float32, dim * 4 bytes
+    model_version TEXT,
+    created_at    REAL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_gesture ON samples(gesture_id);
+CREATE TABLE IF NOT EXISTS migrations (
+    source      TEXT PRIMARY KEY,
+    migrated_at REAL
+);
+"""
+
+
+class GestureStore:
+    # Every capture is one INSERT, whatever the size of the library; SQLite's
+    # locking makes concurrent writers (two windows, a script) safe.
+    def __init__(self, path=STORE_PATH, legacy_json=LEGACY_JSON):
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        if legacy_json and os.path.exists(legacy_json):
+            self.migrate_json(legacy_json)
+
+    def close(self):
+        self.conn.close()
+
+    # ---- writes ----
+    def _gesture_id(self, name):
+        self.conn.execute("INSERT OR IGNORE INTO gestures (name, created_at) VALUES (?, ?)", (name, time.time()))
+        return self.conn.execute("SELECT id FROM gestures WHERE name = ?", (name,)).fetchone()[0]
+
+    def _insert_sample(self, name, vector, model_version, created_at):
+        # Inside a transaction the caller holds
+        vector = np.ascontiguousarray(vector, dtype=DTYPE).ravel()
+        cursor = self.conn.execute(
+            "INSERT INTO samples (gesture_id, dim, vector, model_version, created_at) VALUES (?, ?, ?, ?, ?)",
+            (self._gesture_id(name), vector.size, vector.tobytes(), model_version, created_at or time.time()))
+        return cursor.lastrowid
+
+    def add_sample(self, name, vector, model_version=None, created_at=None):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                sample_id = self._insert_sample(name, vector, model_version, created_at)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return sample_id
+
+    def delete(self, name):
+        with self.lock:
+            self.conn.execute("DELETE FROM gestures WHERE name = ?", (name,))
+
+    # ---- reads ----
+    def names(self):
+        # [(name, sample count)] in creation order
+        with self.lock:
+            return self.conn.execute(
+                "SELECT g.name, COUNT(s.id) FROM gestures g LEFT JOIN samples s ON s.gesture_id = g.id "
+                "GROUP BY g.id ORDER BY g.created_at, g.id").fetchall()
+
+    def load_matrix(self, dim=None, model_version=None):
+        # Every sample in one (N, dim) float32 matrix plus the gesture name of
+        # each row; one query and a single frombuffer, no per-row parsing.
+        # Nothing matches against stored vectors yet (captures are still
+        # placeholders), so only the CLI below calls this for now.
+        sql = "SELECT g.name, s.dim, s.vector FROM samples s JOIN gestures g ON g.id = s.gesture_id"
+        clauses, params = [], []
+        if dim is not None:
+            clauses.append("s.dim = ?")
+            params.append(dim)
+        if model_version is not None:
+            clauses.append("s.model_version = ?")
+            params.append(model_version)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self.lock:
+            rows = self.conn.execute(sql + " ORDER BY s.id", params).fetchall()
+        if not rows:
+            return np.empty((0, dim or 0), dtype=DTYPE), []
+        dims = {r[1] for r in rows}
+        if len(dims) > 1:
+            raise ValueError(f"Samples have different lengths {sorted(dims)}; pass dim= to pick one")
+        matrix = np.frombuffer(b"".join(r[2] for r in rows), dtype=DTYPE).reshape(len(rows), dims.pop())
+        return matrix, [r[0] for r in rows]
+
+    # ---- one-time migration ----
+    def migrate_json(self, path=LEGACY_JSON):
+        # gesture_data.json held {name: [floats]}; each entry becomes one
+        # sample. All rows and the migrations entry commit together under
+        # BEGIN IMMEDIATE, so a crash leaves nothing half-imported and a
+        # second process (another page opening the store) waits, then sees
+        # the entry and skips. The rename afterwards is only tidying up.
+        source = os.path.abspath(path)
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                done = self.conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone()
+                data = None if done else self._read_legacy(path)
+                if data is not None:
+                    created_at = os.path.getmtime(path)
+                    for name, vector in data.items():
+                        self._insert_sample(name, vector, "legacy-json", created_at)
+                    self.conn.execute("INSERT INTO migrations VALUES (?, ?)", (source, time.time()))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        if not done and data is None:
+            return 0  # unreadable: left in place for the next attempt
+        try:
+            os.replace(path, path + ".migrated")
+        except FileNotFoundError:
+            pass  # renamed by the process that migrated it
+        if data is None:
+            return 0
+        print(f"📦 Migrated {len(data)} gestures from {path} to the gesture store")
+        return len(data)
+
+    @staticmethod
+    def _read_legacy(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None  # migrated and renamed by another process meanwhile
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not migrate {path}: {e}")
+            return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the gesture store")
+    parser.add_argument("--store", default=STORE_PATH)
+    args = parser.parse_args()
+
+    store = GestureStore(args.store)
+    start = time.perf_counter()
+    matrix, labels = store.load_matrix()
+    print(f"🧮 Loaded {matrix.shape[0]} samples x {matrix.shape[1]} dims in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    for name, count in store.names():
+        print(f"   {name}: {count} samples")
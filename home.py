@@ -4,13 +4,25 @@ from PyQt5.QtWidgets import (
     QGraphicsDropShadowEffect, QFrame, QSizePolicy, QStackedWidget
 )
 from PyQt5.QtGui import QFont, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
 
-from UI.trainGestures import TrainGestureWindow
-from UI.settings import HandCalibrationWindow
-from UI.liveRecognition import LiveRecognitionWindow
-from UI.gestureLibrary import GestureLibraryWindow
-from UI.analytics import AnalyticsWindow
+from modelLoader import preloader, timer
+from UI.pageManager import PageManager
+
+# Page modules are imported when a page is first built: some of them pull
+# in cv2 / numpy, which have no business on the path to the first window.
+
+MODEL_STATUS = {
+    "idle": "",
+    "loading": "⏳ Loading model…",
+    "ready": "✅ Model ready",
+    "failed": "⚠️ Model failed to load",
+}
+
+
+class ModelStatus(QObject):
+    # Carries preloader state changes from the loader thread to the GUI thread
+    changed = pyqtSignal(str)
 
 class SlimCard(QFrame):
     def __init__(self, title, subtitle="", icon="", parent=None):
@@ -94,8 +106,13 @@ class HomePage(QWidget):
         self.stacked_widget = QStackedWidget()
         self.main_widget = QWidget()
         self.setup_ui()
+        self.register_pages()
         self.apply_theme()
 
+        self.model_status = ModelStatus()
+        self.model_status.changed.connect(self.show_model_status)
+        preloader.add_listener(self.model_status.changed.emit)
+
     def setup_ui(self):
         self.setWindowTitle("Gesture Controller")
         self.resize(950, 650)
@@ -122,6 +139,10 @@ class HomePage(QWidget):
         header_layout.addWidget(self.theme_btn)
         header_layout.addStretch()
 
+        self.model_label = QLabel("")
+        self.model_label.setFont(QFont("Segoe UI", 11))
+        header_layout.addWidget(self.model_label)
+
         self.main_layout.addLayout(header_layout)
 
         self.welcome = QLabel("Welcome back, Royce")
@@ -167,8 +188,11 @@ class HomePage(QWidget):
         self.is_dark_theme = not self.is_dark_theme
         self.apply_theme()
 
+    def show_model_status(self, state):
+        self.model_label.setText(MODEL_STATUS.get(state, ""))
+
     def go_back_home(self):
-        self.stacked_widget.setCurrentWidget(self.main_widget)
+        self.pages.show_home()
 
     def apply_theme(self):
         if self.is_dark_theme:
@@ -177,94 +201,92 @@ class HomePage(QWidget):
             self.theme_btn.setText("☀️")
             self.theme_btn.setStyleSheet("color: #ffffff; background-color: #222; border: 1px solid #444; border-radius: 20px;")
             self.welcome.setStyleSheet("color: white;")
+            self.model_label.setStyleSheet("color: #aaaaaa;")
         else:
             self.setStyleSheet("background-color: #f8fbff;")
             self.logo.setStyleSheet("color: #1e88e5;")
             self.theme_btn.setText("🌙")
             self.theme_btn.setStyleSheet("color: #1a237e; background-color: #ddeeff; border: 1px solid #aaccff; border-radius: 20px;")
             self.welcome.setStyleSheet("color: #1a237e;")
+            self.model_label.setStyleSheet("color: #546e7a;")
 
         for card in self.cards:
             card.apply_theme(self.is_dark_theme)
 
-    def open_train_gesture(self, event):
-        self.train_page = QWidget()
-        layout = QVBoxLayout(self.train_page)
+    # ==== PAGES ====
+    # Each page is built on first use and cached by the page manager, which
+    # suspends it while hidden and evicts it under memory pressure.
+    def register_pages(self):
+        self.pages = PageManager(self.stacked_widget, self.main_widget)
+        self.pages.register("train", self.build_train_page, ["UI.trainGestures"])
+        self.pages.register("settings", self.build_settings_page, ["UI.settings"])
+        self.pages.register("live", self.build_live_page, ["UI.liveRecognition"])
+        self.pages.register("library", self.build_library_page, ["UI.gestureLibrary"])
+        self.pages.register("analytics", self.build_analytics_page, ["UI.analytics"])
+
+    def wrap_page(self, widget):
+        page = QWidget()
+        layout = QVBoxLayout(page)
 
         back_btn = QPushButton("← Back")
         back_btn.setFixedSize(100, 36)
         back_btn.clicked.connect(self.go_back_home)
         layout.addWidget(back_btn, alignment=Qt.AlignLeft)
 
-        train_widget = TrainGestureWindow()
-        layout.addWidget(train_widget)
+        layout.addWidget(widget)
+        return page, widget
 
-        self.stacked_widget.addWidget(self.train_page)
-        self.stacked_widget.setCurrentWidget(self.train_page)
+    def build_train_page(self):
+        from UI.trainGestures import TrainGestureWindow
+        return self.wrap_page(TrainGestureWindow())
 
-    def open_settings(self, event):
-        self.calibration_page = QWidget()
-        layout = QVBoxLayout(self.calibration_page)
+    def build_settings_page(self):
+        from UI.settings import HandCalibrationWindow
+        return self.wrap_page(HandCalibrationWindow())
 
-        back_btn = QPushButton("← Back")
-        back_btn.setFixedSize(100, 36)
-        back_btn.clicked.connect(self.go_back_home)
-        layout.addWidget(back_btn, alignment=Qt.AlignLeft)
+    def build_live_page(self):
+        from UI.liveRecognition import LiveRecognitionWindow
+        return self.wrap_page(LiveRecognitionWindow())
 
-        calibration_widget = HandCalibrationWindow()
-        layout.addWidget(calibration_widget)
+    def build_library_page(self):
+        from UI.gestureLibrary import GestureLibraryWindow
+        return self.wrap_page(GestureLibraryWindow())
 
-        self.stacked_widget.addWidget(self.calibration_page)
-        self.stacked_widget.setCurrentWidget(self.calibration_page)
+    def build_analytics_page(self):
+        from UI.analytics import AnalyticsWindow
+        return self.wrap_page(AnalyticsWindow())
 
-    def open_live_recognition(self, event):
-        self.live_page = QWidget()
-        layout = QVBoxLayout(self.live_page)
+    def closeEvent(self, event):
+        self.pages.show_home()  # suspends the visible page: camera released, threads joined
+        preloader.remove_listener(self.model_status.changed.emit)
+        super().closeEvent(event)
 
-        back_btn = QPushButton("← Back")
-        back_btn.setFixedSize(100, 36)
-        back_btn.clicked.connect(self.go_back_home)
-        layout.addWidget(back_btn, alignment=Qt.AlignLeft)
+    def open_train_gesture(self, event):
+        self.pages.show("train")
 
-        live_widget = LiveRecognitionWindow()
-        layout.addWidget(live_widget)
+    def open_settings(self, event):
+        self.pages.show("settings")
 
-        self.stacked_widget.addWidget(self.live_page)
-        self.stacked_widget.setCurrentWidget(self.live_page)
+    def open_live_recognition(self, event):
+        self.pages.show("live")
 
     def open_gesture_library(self, event):
-        self.library_page = QWidget()
-        layout = QVBoxLayout(self.library_page)
-
-        back_btn = QPushButton("← Back")
-        back_btn.setFixedSize(100, 36)
-        back_btn.clicked.connect(self.go_back_home)
-        layout.addWidget(back_btn, alignment=Qt.AlignLeft)
-
-        lib_widget = GestureLibraryWindow()
-        layout.addWidget(lib_widget)
-
-        self.stacked_widget.addWidget(self.library_page)
-        self.stacked_widget.setCurrentWidget(self.library_page)
+        self.pages.show("library")
 
     def open_analytics(self, event):
-        self.analytics_page = QWidget()
-        layout = QVBoxLayout(self.analytics_page)
-
-        back_btn = QPushButton("← Back")
-        back_btn.setFixedSize(100, 36)
-        back_btn.clicked.connect(self.go_back_home)
-        layout.addWidget(back_btn, alignment=Qt.AlignLeft)
-
-        analytics_widget = AnalyticsWindow()
-        layout.addWidget(analytics_widget)
-
-        self.stacked_widget.addWidget(self.analytics_page)
-        self.stacked_widget.setCurrentWidget(self.analytics_page)
+        self.pages.show("analytics")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     window = HomePage()
     window.show()
-    sys.exit(app.exec_())
+
+    def on_first_window():
+        timer.mark("first_window")
+        preloader.start()  # load the model behind the home page
+
+    QTimer.singleShot(0, on_first_window)
+    code = app.exec_()
+    timer.report()
+    sys.exit(code)
@@ -0,0 +1,246 @@
+import argparse
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from predictor import MODES, load_predictor, to_label
+
+# ==== CONFIG ====
+MAX_BATCH = 8
+MAX_WAIT_MS = 10
+LATENCY_WINDOW = 500  # per-stream latency samples kept for percentiles
+REPORT_EVERY = 5.0
+
+
+# ==== SOURCES ====
+class CaptureSource:
+    # Camera index or video file, read through cv2.VideoCapture.
+    def __init__(self, spec):
+        self.name = str(spec)
+        self.cap = cv2.VideoCapture(spec)
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class SocketSource:
+    # Local stand-in for a network camera: accepts one client on
+    # 127.0.0.1:<port> that sends frames as a 4-byte big-endian length
+    # followed by JPEG bytes.
+    def __init__(self, port):
+        self.name = f"tcp:{port}"
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", port))
+        self.server.listen(1)
+        self.conn = None
+
+    def _recv_exact(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.conn.recv(size - len(data))
+            if not chunk:
+                return None
+            data.extend(chunk)
+        return data
+
+    def read(self):
+        if self.conn is None:
+            self.conn, _ = self.server.accept()
+        header = self._recv_exact(4)
+        if header is None:
+            return False, None
+        payload = self._recv_exact(struct.unpack(">I", header)[0])
+        if payload is None:
+            return False, None
+        frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return frame is not None, frame
+
+    def release(self):
+        if self.conn is not None:
+            self.conn.close()
+        self.server.close()
+
+
+def open_source(spec):
+    if spec.isdigit():
+        return CaptureSource(int(spec))
+    if spec.startswith("tcp:"):
+        return SocketSource(int(spec[4:]))
+    return CaptureSource(spec)
+
+
+# ==== PER-STREAM STATE ====
+class StreamStats:
+    def __init__(self, name):
+        self.name = name
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.last_result = None
+
+    def summary(self):
+        lat = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "stream": self.name,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "p50_ms": float(np.percentile(lat, 50)),
+            "p95_ms": float(np.percentile(lat, 95)),
+            "max_ms": float(lat.max()),
+        }
+
+
+# ==== MICRO-BATCHER ====
+class InferenceServer:
+    # Every stream keeps at most one pending frame (newest wins). The batch
+    # loop fires as soon as max_batch streams are waiting or the oldest
+    # pending frame has waited max_wait_ms, then runs the CNN once.
+    def __init__(self, predictor, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, on_result=None):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.on_result = on_result
+
+        self.streams = {}
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+
+        self.batches = 0
+        self.batched_frames = 0
+        self.started_at = None
+
+    def add_source(self, source):
+        stream_id = len(self.streams)
+        self.streams[stream_id] = StreamStats(source.name)
+        thread = threading.Thread(target=self._read_loop, args=(stream_id, source),
+                                  name=f"source-{stream_id}", daemon=True)
+        self._threads.append(thread)
+        return stream_id
+
+    def submit(self, stream_id, frame):
+        with self._cond:
+            stats = self.streams[stream_id]
+            if stream_id in self._pending:
+                stats.dropped += 1
+            self._pending[stream_id] = (frame, time.perf_counter())
+            stats.submitted += 1
+            self._cond.notify()
+
+    def _read_loop(self, stream_id, source):
+        try:
+            while not self._stop.is_set():
+                ret, frame = source.read()
+                if not ret:
+                    break
+                self.submit(stream_id, frame)
+        finally:
+            source.release()
+
+    def _next_batch(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._stop.is_set())
+            if self._stop.is_set():
+                return []
+            oldest = min(t for _, t in self._pending.values())
+            deadline = oldest + self.max_wait
+            while len(self._pending) < self.max_batch and not self._stop.is_set():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            ready = sorted(self._pending.items(), key=lambda item: item[1][1])[:self.max_batch]
+            for stream_id, _ in ready:
+                del self._pending[stream_id]
+            return ready
+
+    def _batch_loop(self):
+        while not self._stop.is_set():
+            ready = self._next_batch()
+            if not ready:
+                continue
+            scores = self.predictor.predict_batch([frame for _, (frame, _) in ready])
+            done = time.perf_counter()
+
+            self.batches += 1
+            self.batched_frames += len(ready)
+            for (stream_id, (frame, submitted_at)), score in zip(ready, scores):
+                stats = self.streams[stream_id]
+                stats.completed += 1
+                stats.latencies.append(done - submitted_at)
+                stats.last_result = to_label(float(score))
+                if self.on_result is not None:
+                    self.on_result(stream_id, frame, stats.last_result)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._threads.append(threading.Thread(target=self._batch_loop, name="batcher", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def report(self):
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return {
+            "elapsed_s": elapsed,
+            "throughput_fps": self.batched_frames / elapsed,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_frames / max(self.batches, 1),
+            "streams": [stats.summary() for stats in self.streams.values()],
+        }
+
+
+def print_report(report):
+    print(f"\n📊 {report['throughput_fps']:.1f} frames/s across {len(report['streams'])} streams | "
+          f"{report['batches']} batches, avg size {report['avg_batch_size']:.2f}")
+    for s in report["streams"]:
+        print(f"   {s['stream']:>20}: done {s['completed']:>6} | dropped {s['dropped']:>5} | "
+              f"p50 {s['p50_ms']:.1f} ms | p95 {s['p95_ms']:.1f} ms | max {s['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared micro-batching hand detector for several cameras")
+    parser.add_argument("--source", action="append", required=True,
+                        help="camera index, video file or tcp:<port>; repeat for each stream")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--model", choices=MODES)
+    parser.add_argument("--duration", type=float, default=0, help="seconds to run, 0 = until Ctrl+C")
+    args = parser.parse_args()
+
+    predictor = load_predictor(args.model, max_batch=args.max_batch)
+    server = InferenceServer(predictor, args.max_batch, args.max_wait_ms)
+    for spec in args.source:
+        server.add_source(open_source(spec))
+
+    print(f"🚀 Serving {len(args.source)} streams with the {predictor.backend} backend (Ctrl+C to stop)")
+    server.start()
+    try:
+        end = time.perf_counter() + args.duration if args.duration else float("inf")
+        while time.perf_counter() < end:
+            time.sleep(max(0.0, min(REPORT_EVERY, end - time.perf_counter())))
+            print_report(server.report())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print_report(server.report())
@@ -0,0 +1,145 @@
+import json
+import sys
+import threading
+import time
+
+# Nothing heavy is imported at module level: this file sits on the app's
+# startup path, and the whole point is that TensorFlow / cv2 are not.
+
+# ==== CONFIG ====
+TIMINGS_PATH = "startup_timings.jsonl"
+HEAVY_MODULES = ["tensorflow", "cv2", "tflite_runtime", "onnxruntime"]
+POLL_S = 0.1             # how often wait() checks its cancelled() callback
+
+
+# ==== STARTUP TIMER ====
+# Milestones in ms since launch: first_window, model_ready, first_prediction.
+# Each is recorded once; report() appends one JSON line per run.
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = {}
+        self.heavy_at_first_window = None
+        self.lock = threading.Lock()
+
+    def begin(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+
+    def mark(self, name):
+        with self.lock:
+            if name in self.marks:
+                return
+            self.marks[name] = round((time.perf_counter() - self.started) * 1000, 1)
+            if name == "first_window":
+                self.heavy_at_first_window = [m for m in HEAVY_MODULES if m in sys.modules]
+        print(f"⏱️ {name}: {self.marks[name]:.0f} ms after launch")
+
+    def report(self, path=TIMINGS_PATH):
+        entry = {"time": time.time(), **self.marks,
+                 "heavy_imports_at_first_window": self.heavy_at_first_window}
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+
+timer = StartupTimer()
+
+
+# ==== BACKGROUND PRELOAD ====
+# Loads and warms up the predictor on a daemon thread (the import of
+# TensorFlow included) while the home page is up, before any page needs it.
+# Listeners (HomePage's status label) hear every state change.
+# The loaded predictor is meant for one consumer at a time, like any
+# BasePredictor.
+class ModelPreloader:
+    IDLE, LOADING, READY, FAILED = "idle", "loading", "ready", "failed"
+
+    def __init__(self):
+        self.state = self.IDLE
+        self.mode = None
+        self.predictor = None
+        self.error = None
+        self._done = threading.Event()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def start(self, mode=None):
+        with self._lock:
+            if self.state != self.IDLE:
+                return
+            if mode is None:
+                from userSettings import load_settings
+                mode = load_settings()["model"]
+            self.mode = mode
+            self._set_state(self.LOADING)
+        threading.Thread(target=self._load, name="model-preload", daemon=True).start()
+
+    def _load(self):
+        try:
+            from predictor import load_predictor
+            self.predictor = load_predictor(self.mode)  # constructors warm up
+            timer.mark("model_ready")
+            state = self.READY
+        except Exception as e:
+            self.error = e
+            print(f"⚠️ Model preload failed: {e}")
+            state = self.FAILED
+        self._done.set()
+        with self._lock:
+            self._set_state(state)
+
+    def _set_state(self, state):
+        # Listeners run on whichever thread changed the state; Qt code should
+        # forward through a signal (see home.py).
+        self.state = state
+        for listener in list(self._listeners):
+            listener(state)
+
+    def add_listener(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+            listener(self.state)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    @property
+    def ready(self):
+        return self.state == self.READY
+
+    def wait(self, mode=None, timeout=None, cancelled=None):
+        # The preloaded predictor if it matches `mode`, else None (also when
+        # nothing was preloaded, on timeout, or once `cancelled()` is true),
+        # so the caller falls back to a normal load or gives up. `cancelled`
+        # is polled every POLL_S, letting a worker thread stop mid-wait.
+        if self.state == self.IDLE or (mode is not None and mode != self.mode):
+            return None
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self._done.is_set():
+            if cancelled is not None and cancelled():
+                return None
+            remaining = POLL_S if deadline is None else min(POLL_S, deadline - time.perf_counter())
+            if remaining <= 0:
+                return None
+            self._done.wait(remaining)
+        return self.predictor
+
+
+preloader = ModelPreloader()
+
+
+if __name__ == "__main__":
+    # Headless measurement of the same path: import + load + warm-up, then
+    # the first real prediction.
+    import numpy as np
+
+    timer.begin()
+    preloader.start()
+    predictor = preloader.wait()
+    if predictor is None:
+        sys.exit(f"❌ {preloader.error}")
+    predictor.predict_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+    timer.mark("first_prediction")
+    print(json.dumps(timer.report()))
@@ -0,0 +1,83 @@
+import time
+
+import cv2
+import numpy as np
+
+# ==== CONFIG ====
+GATE_SIZE = (32, 24)      # frame is block-averaged down to this many cells
+PIXEL_DELTA = 12          # grey-level change for a cell to count as changed
+CHANGED_FRACTION = 0.02   # fraction of changed cells that triggers inference
+MAX_STALE_S = 1.0         # always re-run the CNN at least this often
+
+
+# ==== CHANGE DETECTOR ====
+class MotionGate:
+    # Compares the current frame against the one the last inference ran on
+    # (not the previous frame), so slow drift still adds up to a trigger.
+    def __init__(self, pixel_delta=PIXEL_DELTA, changed_fraction=CHANGED_FRACTION,
+                 max_stale_s=MAX_STALE_S, size=GATE_SIZE):
+        self.pixel_delta = pixel_delta
+        self.changed_fraction = changed_fraction
+        self.max_stale_s = max_stale_s
+        self.size = size
+
+        self._gray = None
+        self._small = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._diff = np.empty_like(self._small)
+        self._reference = None
+        self._reference_at = 0.0
+        self.last_score = 0.0
+
+    def _shrink(self, frame):
+        self._gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.resize(self._gray, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        return self._small
+
+    def should_run(self, frame):
+        small = self._shrink(frame)
+        now = time.perf_counter()
+        if self._reference is None or now - self._reference_at >= self.max_stale_s:
+            self.last_score = 1.0
+        else:
+            cv2.absdiff(small, self._reference, dst=self._diff)
+            self.last_score = float(np.count_nonzero(self._diff > self.pixel_delta)) / self._diff.size
+            if self.last_score < self.changed_fraction:
+                return False
+
+        if self._reference is None:
+            self._reference = small.copy()
+        else:
+            self._reference[...] = small
+        self._reference_at = now
+        return True
+
+
+# ==== GATED CLASSIFIER ====
+# Drop-in for predictor.classify: reuses the previous label/confidence
+# while the gate reports a static scene.
+class GatedClassifier:
+    def __init__(self, predictor, gate=None):
+        self.predictor = predictor
+        self.gate = gate or MotionGate()
+        self.last = None
+        self.frames = 0
+        self.inferences = 0
+
+    def classify(self, frame):
+        self.frames += 1
+        if self.gate.should_run(frame) or self.last is None:
+            self.last = self.predictor.classify(frame)
+            self.inferences += 1
+        return self.last
+
+    @property
+    def skipped_fraction(self):
+        return 1 - self.inferences / max(self.frames, 1)
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "skipped_fraction": self.skipped_fraction,
+            "last_motion_score": self.gate.last_score,
+        }
@@ -0,0 +1,124 @@
+import argparse
+import os
+import sys
+import time
+
+# Runs without a display unless told otherwise
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from home import HomePage
+from modelLoader import preloader
+from UI.pageManager import camera_handles, current_rss_mb
+
+# ==== CONFIG ====
+ROUTE = ["train", "live", "settings", "library", "analytics"]
+ROUNDS = 20
+DWELL_S = 0.3        # time spent on each page, long enough for cameras to open
+WARMUP_ROUNDS = 2    # first builds, imports and model load happen here
+RSS_TOLERANCE_MB = 25
+
+
+def pump(app, seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+# Cycles through every page the way a user clicking the cards would, and
+# checks that memory stays flat after warm-up, that at most one camera is
+# ever open (none once back on the home page) and that every page is built
+# once and then reused. By default the model is loaded first, as in the
+# app, so the page budget is exercised with TensorFlow's memory in the RSS.
+def check_navigation(rounds=ROUNDS, dwell=DWELL_S, tolerance_mb=RSS_TOLERANCE_MB, load_model=True):
+    app = QApplication.instance() or QApplication(sys.argv)
+    if load_model:
+        preloader.start()
+        if preloader.wait() is None:
+            return [f"model did not load: {preloader.error}"]
+        print(f"🧠 Model loaded, rss {current_rss_mb() or 0:.1f} MB")
+    home = HomePage()
+    home.show()
+
+    rss, peak_cameras, leaked_cameras = [], 0, 0
+    for r in range(rounds):
+        for key in ROUTE:
+            widget = home.pages.show(key)
+            if key == "train":
+                widget.start_camera()
+            pump(app, dwell)
+            peak_cameras = max(peak_cameras, camera_handles.count)
+            home.go_back_home()
+            pump(app, dwell / 3)
+            leaked_cameras = max(leaked_cameras, camera_handles.count)
+        rss.append(current_rss_mb())
+        stats = home.pages.stats()
+        print(f"round {r + 1:>3}: rss {rss[-1] or 0:7.1f} MB, cached pages {stats['cached']} "
+              f"({stats['cached_mb']:.0f} MB), built {stats['built']}, evicted {stats['evicted']}, "
+              f"cameras open on home {camera_handles.count}")
+
+    home.close()
+    failures = []
+    if rss[0] is not None and len(rss) > WARMUP_ROUNDS:
+        growth = rss[-1] - rss[WARMUP_ROUNDS - 1]
+        print(f"📊 RSS after warm-up grew {growth:+.1f} MB over {rounds - WARMUP_ROUNDS} rounds")
+        if growth > tolerance_mb:
+            failures.append(f"RSS grew {growth:.1f} MB (> {tolerance_mb} MB)")
+    if peak_cameras > 1:
+        failures.append(f"{peak_cameras} cameras open at once")
+    if leaked_cameras:
+        failures.append(f"{leaked_cameras} camera(s) still open after leaving a page")
+    if stats["built"] != len(ROUTE):
+        failures.append(f"{stats['built']} page builds for {len(ROUTE)} pages ({stats['evicted']} evictions)")
+    return failures
+
+
+# With a budget nothing fits in, leaving a page must evict it: its camera
+# is released at once and showing it again builds a fresh widget.
+def check_eviction(dwell=DWELL_S):
+    app = QApplication.instance() or QApplication(sys.argv)
+    home = HomePage()
+    home.pages.budget_mb = 0
+    home.pages.max_pages = 1
+    home.show()
+
+    failures = []
+    first = home.pages.show("train")
+    first.start_camera()
+    pump(app, dwell)
+    had_camera = camera_handles.count > 0
+
+    home.pages.show("library")
+    pump(app, dwell / 3)
+    stats = home.pages.stats()
+    print(f"evict: cached pages {stats['cached']}, built {stats['built']}, evicted {stats['evicted']}, "
+          f"cameras open {camera_handles.count}{'' if had_camera else ' (no camera available)'}")
+    if "train" in home.pages.pages or stats["evicted"] < 1:
+        failures.append("hidden page was not evicted over budget")
+    if camera_handles.count:
+        failures.append(f"{camera_handles.count} camera(s) still open after eviction")
+
+    again = home.pages.show("train")
+    if again is first or home.pages.stats()["built"] != stats["built"] + 1:
+        failures.append("evicted page was not rebuilt")
+    home.close()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that repeated page navigation keeps RSS and camera handles flat")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--dwell", type=float, default=DWELL_S)
+    parser.add_argument("--tolerance-mb", type=float, default=RSS_TOLERANCE_MB)
+    parser.add_argument("--no-model", action="store_true", help="skip loading the model first")
+    args = parser.parse_args()
+
+    failures = check_navigation(args.rounds, args.dwell, args.tolerance_mb, not args.no_model)
+    failures += check_eviction(args.dwell)
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Navigation is leak-free and eviction releases pages")
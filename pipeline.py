@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+Frame = namedtuple("Frame", ["index", "captured_at", "image"])
+Result = namedtuple("Result", ["index", "captured_at", "inferred_at", "image", "label", "confidence"])
+
+
+# ==== LATEST-FRAME-WINS BUFFER ====
+class LatestFrameBuffer:
+    # Single-slot handoff between two stages. A put() over an unread item
+    # replaces it, so the consumer always sees the newest one and the
+    # overwritten item is counted as dropped.
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: self._item is not None or self._closed, timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        with self._cond:
+            return self._closed and self._item is None
+
+
+# ==== CAPTURE -> INFERENCE -> DISPLAY ====
+class RecognitionPipeline:
+    # source: anything with a cv2.VideoCapture-style read()
+    # predict_fn: frame -> (label, confidence)
+    def __init__(self, source, predict_fn, flip=True):
+        self.source = source
+        self.predict_fn = predict_fn
+        self.flip = flip
+
+        self.frames = LatestFrameBuffer()
+        self.results = LatestFrameBuffer()
+        self._stop = threading.Event()
+        self._threads = []
+
+        self.captured = 0
+        self.inferred = 0
+        self.displayed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.frames.close()
+        self.results.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    @property
+    def running(self):
+        return not self.results.closed
+
+    def _capture_loop(self):
+        try:
+            while not self._stop.is_set():
+                ret, image = self.source.read()
+                if not ret:
+                    break
+                if self.flip:
+                    image = cv2.flip(image, 1)
+                self.frames.put(Frame(self.captured, time.perf_counter(), image))
+                self.captured += 1
+        finally:
+            self.frames.close()
+
+    def _inference_loop(self):
+        try:
+            while not self._stop.is_set():
+                frame = self.frames.get(timeout=0.5)
+                if frame is None:
+                    if self.frames.closed:
+                        break
+                    continue
+                label, confidence = self.predict_fn(frame.image)
+                self.results.put(Result(frame.index, frame.captured_at, time.perf_counter(),
+                                        frame.image, label, confidence))
+                self.inferred += 1
+        finally:
+            self.results.close()
+
+    def latest_result(self, timeout=None):
+        # Called from the display (main) thread; cv2.imshow must stay there.
+        result = self.results.get(timeout)
+        if result is not None:
+            latency = time.perf_counter() - result.captured_at
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.displayed += 1
+        return result
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "inferred": self.inferred,
+            "displayed": self.displayed,
+            "dropped_before_inference": self.frames.dropped,
+            "dropped_before_display": self.results.dropped,
+            "avg_latency_ms": 1000 * self.total_latency / max(self.displayed, 1),
+            "max_latency_ms": 1000 * self.max_latency,
+        }
@@ -0,0 +1,184 @@
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from preprocess import IMAGE_SIZE, Preprocessor
+
+# ==== CONFIG ====
+MODEL_PATH = "cnn1_hand_vs_nohand_final.h5"
+STUDENT_PATH = "cnn1_hand_vs_nohand_student.h5"  # distilled by distill.py
+EXPORT_DIR = "exported_models"
+TFLITE_INT8_PATH = os.path.join(EXPORT_DIR, "cnn1_hand_vs_nohand_int8.tflite")
+TFLITE_FLOAT16_PATH = os.path.join(EXPORT_DIR, "cnn1_hand_vs_nohand_float16.tflite")
+ONNX_PATH = os.path.join(EXPORT_DIR, "cnn1_hand_vs_nohand.onnx")
+ONNX_INT8_PATH = os.path.join(EXPORT_DIR, "cnn1_hand_vs_nohand_int8.onnx")
+LABELS = ["Hand", "No Hand"]  # class index order from flow_from_directory
+THRESHOLD = 0.5
+MAX_BATCH = 32
+NUM_THREADS = os.cpu_count() or 1
+
+# Detection Model choices: "Small" is the distilled student.
+MODES = ["Fast", "Accurate", "Small"]
+
+# "Fast" tries the quantized exports in this order before giving up and
+# falling back to the full Keras model.
+FAST_CANDIDATES = [TFLITE_INT8_PATH, TFLITE_FLOAT16_PATH, ONNX_INT8_PATH]
+
+
+# ==== SHARED FRONT END ====
+# Input buffers are allocated once and reused; a predictor instance is
+# therefore not safe to share between threads. Backends implement
+# predict_array().
+class BasePredictor(ABC):
+    def __init__(self, max_batch=MAX_BATCH):
+        self.max_batch = max_batch
+        self._prepare = Preprocessor()
+        self._single = np.zeros((1, IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.float32)
+        self._batch = np.zeros((max_batch, IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.float32)
+
+    @abstractmethod
+    def predict_array(self, batch):
+        # batch: already preprocessed float32, shape (N, 128, 128, 3);
+        # returns P(no_hand) per row
+        pass
+
+    def warmup(self):
+        self.predict_array(self._single)
+
+    def preprocess(self, frame):
+        # Fills and returns the reusable (1, 128, 128, 3) input buffer.
+        self._prepare(frame, self._single[0])
+        return self._single
+
+    def predict_frame(self, frame):
+        return float(self.predict_array(self.preprocess(frame))[0])
+
+    def predict_batch(self, frames):
+        scores = np.empty(len(frames), dtype=np.float32)
+        for start in range(0, len(frames), self.max_batch):
+            chunk = frames[start:start + self.max_batch]
+            for i, frame in enumerate(chunk):
+                self._prepare(frame, self._batch[i])
+            scores[start:start + len(chunk)] = self.predict_array(self._batch[:len(chunk)])
+        return scores
+
+    def classify(self, frame):
+        return to_label(self.predict_frame(frame))
+
+
+# ==== KERAS BACKEND ("Accurate") ====
+# Wraps the trained CNN behind a traced tf.function with a fixed input
+# signature, so a call skips Keras' predict() batching/callback machinery.
+class Predictor(BasePredictor):
+    backend = "keras"
+
+    def __init__(self, model_path=MODEL_PATH, max_batch=MAX_BATCH):
+        super().__init__(max_batch)
+        # Imported here so the quantized backends never pull in TensorFlow.
+        import tensorflow as tf
+
+        self.model_path = model_path
+        self.model = tf.keras.models.load_model(model_path, compile=False)
+        spec = tf.TensorSpec(shape=(None, IMAGE_SIZE, IMAGE_SIZE, 3), dtype=tf.float32)
+        self._infer = tf.function(lambda x: self.model(x, training=False), input_signature=[spec])
+        self.warmup()
+
+    def warmup(self):
+        # Trace the graph for both the single-frame and the full-batch shape
+        # so the first real frame does not pay the tracing cost.
+        self.predict_array(self._single)
+        self.predict_array(self._batch)
+
+    def predict_array(self, batch):
+        return self._infer(batch).numpy()[:, 0]
+
+
+# ==== TFLITE BACKEND ("Fast") ====
+class TFLitePredictor(BasePredictor):
+    backend = "tflite"
+
+    def __init__(self, model_path, max_batch=MAX_BATCH, num_threads=NUM_THREADS):
+        super().__init__(max_batch)
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self._input = self.interpreter.get_input_details()[0]["index"]
+        self._output = self.interpreter.get_output_details()[0]["index"]
+        self._batch_size = None
+        self.warmup()
+
+    def predict_array(self, batch):
+        # The interpreter is planned for one batch size at a time; only
+        # re-allocate when the size actually changes.
+        if batch.shape[0] != self._batch_size:
+            self.interpreter.resize_tensor_input(self._input, batch.shape)
+            self.interpreter.allocate_tensors()
+            self._batch_size = batch.shape[0]
+        self.interpreter.set_tensor(self._input, np.ascontiguousarray(batch))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output)[:, 0].copy()
+
+
+# ==== ONNX RUNTIME BACKEND ("Fast") ====
+class OnnxPredictor(BasePredictor):
+    backend = "onnx"
+
+    def __init__(self, model_path, max_batch=MAX_BATCH, num_threads=NUM_THREADS):
+        super().__init__(max_batch)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input = self.session.get_inputs()[0].name
+        self.warmup()
+
+    def predict_array(self, batch):
+        return self.session.run(None, {self._input: batch})[0][:, 0]
+
+
+def open_model(path, max_batch=MAX_BATCH, num_threads=NUM_THREADS):
+    # num_threads only applies to the TFLite/ONNX backends; TensorFlow's
+    # pools are fixed per process (see evaluate.py / sweep.py).
+    if path.endswith(".tflite"):
+        return TFLitePredictor(path, max_batch, num_threads)
+    if path.endswith(".onnx"):
+        return OnnxPredictor(path, max_batch, num_threads)
+    return Predictor(path, max_batch)
+
+
+def load_predictor(mode=None, max_batch=MAX_BATCH):
+    # mode: one of MODES; defaults to the Detection Model setting.
+    if mode is None:
+        from userSettings import load_settings
+        mode = load_settings()["model"]
+
+    if mode == "Fast":
+        for path in FAST_CANDIDATES:
+            if not os.path.exists(path):
+                continue
+            try:
+                return open_model(path, max_batch)
+            except ImportError:
+                continue
+        print("⚠️ No quantized model found, falling back to the full Keras model. Run quantize.py first.")
+
+    if mode == "Small":
+        if os.path.exists(STUDENT_PATH):
+            return Predictor(STUDENT_PATH, max_batch)
+        print("⚠️ No student model found, falling back to the full Keras model. Run distill.py first.")
+
+    return Predictor(MODEL_PATH, max_batch)
+
+
+def to_label(score, threshold=THRESHOLD):
+    if score > threshold:
+        return LABELS[1], score
+    return LABELS[0], 1 - score
@@ -0,0 +1,127 @@
+import cv2
+import numpy as np
+
+# ==== CONFIG ====
+# The single definition of what the CNN sees. train.py, every predictor
+# backend and the evaluation tools all go through this module, so a frame
+# from cv2.VideoCapture and a JPEG from dataset1 end up as the same tensor:
+# RGB channel order, INTER_AREA resize to 128x128, float32 in [0, 1].
+IMAGE_SIZE = 128
+SCALE = np.float32(1.0 / 255)
+INTERPOLATION = cv2.INTER_AREA
+
+
+def resize_rgb(image, out=None, scratch=None):
+    # BGR uint8 (any size) -> RGB uint8 (IMAGE_SIZE, IMAGE_SIZE, 3)
+    if scratch is None:
+        scratch = np.empty((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+    if out is None:
+        out = np.empty((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+    cv2.resize(image, (IMAGE_SIZE, IMAGE_SIZE), dst=scratch, interpolation=INTERPOLATION)
+    cv2.cvtColor(scratch, cv2.COLOR_BGR2RGB, dst=out)
+    return out
+
+
+def to_float(rgb, out=None):
+    # uint8 -> float32 in [0, 1]; same arithmetic as ImageDataGenerator(rescale=1./255)
+    if out is None:
+        out = np.empty(rgb.shape, dtype=np.float32)
+    np.multiply(rgb, SCALE, out=out)
+    return out
+
+
+def load_rgb(path, out=None):
+    image = cv2.imread(path)
+    if image is None:
+        return None
+    return resize_rgb(image, out)
+
+
+def load_rgb_batch(paths):
+    # Returns (uint8 array, indices of the paths that decoded)
+    images = np.empty((len(paths), IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+    kept = []
+    for i, path in enumerate(paths):
+        if load_rgb(path, out=images[len(kept)]) is not None:
+            kept.append(i)
+    return images[:len(kept)], kept
+
+
+# ==== REUSABLE FRAME PREPROCESSOR ====
+# Owns its intermediate buffers so the per-frame path does no allocation.
+class Preprocessor:
+    def __init__(self):
+        self._scratch = np.empty((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+        self._rgb = np.empty((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+
+    def __call__(self, frame, out):
+        resize_rgb(frame, out=self._rgb, scratch=self._scratch)
+        return to_float(self._rgb, out=out)
+
+
+# ==== TRAIN / SERVE PARITY ====
+# Both sides are compared with Keras' own loader, the way flow_from_directory
+# read images before this module existed: PIL decode (RGB by construction)
+# and load_img(target_size=...) resize, with the box filter that matches
+# INTER_AREA. The decoders and resamplers differ, so a small mean difference
+# is expected; a BGR/RGB swap, a different interpolation or a missing
+# rescale shows up far above it.
+PARITY_TOLERANCE = 0.02  # mean absolute difference, in [0, 1] pixel units
+
+
+def reference_tensor(path):
+    from tensorflow.keras.preprocessing.image import img_to_array, load_img
+
+    img = load_img(path, target_size=(IMAGE_SIZE, IMAGE_SIZE), interpolation="box")
+    return img_to_array(img, dtype="float32") / 255
+
+
+def check_parity(paths, datagen=None, tolerance=PARITY_TOLERANCE):
+    # Training side: load_rgb through the generator's standardize(), as in
+    # train.py. Serving side: the BGR frame (what cv2.VideoCapture and
+    # cv2.imread both deliver) through Preprocessor. Returns the worst mean
+    # difference of each side from the reference; raises on a mismatch.
+    if datagen is None:
+        from tensorflow.keras.preprocessing.image import ImageDataGenerator
+        datagen = ImageDataGenerator(rescale=1./255)
+    prep = Preprocessor()
+    served = np.empty((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.float32)
+    worst = {"train": 0.0, "serve": 0.0}
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+        reference = reference_tensor(path)
+        trained = datagen.standardize(load_rgb(path).astype(np.float32))
+        prep(frame, served)
+        for side, tensor in (("train", trained), ("serve", served)):
+            diff = float(np.abs(tensor - reference).mean())
+            worst[side] = max(worst[side], diff)
+            if diff > tolerance:
+                swapped = float(np.abs(tensor[..., ::-1] - reference).mean())
+                raise ValueError(f"{side} preprocessing differs from the Keras loader on {path}: "
+                                 f"mean |diff| {diff:.4f} > {tolerance} (channels swapped: {swapped:.4f})")
+        if not np.allclose(trained, served, rtol=0, atol=1e-6):
+            raise ValueError(f"Train/serve preprocessing mismatch on {path}")
+    return worst
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from dataset import DATA_DIR, sample_images
+
+    parser = argparse.ArgumentParser(description="Check train/serve preprocessing against the Keras image loader")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--limit", type=int, default=64)
+    parser.add_argument("--tolerance", type=float, default=PARITY_TOLERANCE)
+    args = parser.parse_args()
+
+    paths = [path for path, _ in sample_images(args.data_dir, args.limit)]
+    try:
+        worst = check_parity(paths, tolerance=args.tolerance)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    print(f"✅ {len(paths)} images: worst mean |diff| from the Keras loader "
+          f"train {worst['train']:.4f}, serve {worst['serve']:.4f} (tolerance {args.tolerance})")
@@ -0,0 +1,144 @@
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from dataset import DATA_DIR, load_samples
+from predictor import (
+    MODEL_PATH, EXPORT_DIR, TFLITE_INT8_PATH, TFLITE_FLOAT16_PATH,
+    ONNX_PATH, ONNX_INT8_PATH, THRESHOLD, open_model
+)
+from preprocess import IMAGE_SIZE
+
+# ==== CONFIG ====
+CALIBRATION_SAMPLES = 200
+EVAL_SAMPLES = None  # None = every image in DATA_DIR
+REPORT_PATH = os.path.join(EXPORT_DIR, "export_report.json")
+
+
+# ==== CALIBRATION ====
+def representative_dataset(calibration):
+    def gen():
+        for sample in calibration:
+            yield [sample[np.newaxis]]
+    return gen
+
+
+# ==== EXPORTERS ====
+def export_tflite_float16(model, path=TFLITE_FLOAT16_PATH):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+    return path
+
+
+def export_tflite_int8(model, calibration, path=TFLITE_INT8_PATH):
+    # Full-integer kernels, float32 in/out so preprocessing stays unchanged.
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset(calibration)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+    return path
+
+
+def export_onnx(model, calibration, path=ONNX_PATH, int8_path=ONNX_INT8_PATH):
+    # Optional: only runs when tf2onnx / onnxruntime are installed.
+    try:
+        import tf2onnx
+        from onnxruntime.quantization import (
+            CalibrationDataReader, QuantFormat, QuantType, quantize_static
+        )
+    except ImportError:
+        print("⚠️ tf2onnx/onnxruntime not installed, skipping ONNX export.")
+        return []
+
+    spec = (tf.TensorSpec((None, IMAGE_SIZE, IMAGE_SIZE, 3), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=13, output_path=path)
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self._samples = iter(calibration)
+
+        def get_next(self):
+            sample = next(self._samples, None)
+            return None if sample is None else {"input": sample[np.newaxis]}
+
+    quantize_static(path, int8_path, Reader(), quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QInt8, weight_type=QuantType.QInt8)
+    return [path, int8_path]
+
+
+def export_all(model_path=MODEL_PATH, data_dir=DATA_DIR):
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    model = tf.keras.models.load_model(model_path, compile=False)
+
+    # Calibrate on a different shuffle than the evaluation set uses.
+    calibration, _ = load_samples(data_dir, limit=CALIBRATION_SAMPLES, seed=1)
+    print(f"🎯 Calibrating with {len(calibration)} samples from '{data_dir}'")
+
+    paths = [
+        export_tflite_float16(model),
+        export_tflite_int8(model, calibration),
+    ]
+    paths += export_onnx(model, calibration)
+    for path in paths:
+        print(f"✅ Exported {path}")
+    return paths
+
+
+# ==== ACCURACY / LATENCY REPORT ====
+def evaluate(predictor, x, y):
+    scores = np.concatenate([
+        predictor.predict_array(x[i:i + 1]) for i in range(len(x))
+    ])
+    accuracy = float(np.mean((scores > THRESHOLD) == y))
+
+    start = time.perf_counter()
+    for i in range(min(len(x), 100)):
+        predictor.predict_array(x[i:i + 1])
+    latency_ms = 1000 * (time.perf_counter() - start) / max(min(len(x), 100), 1)
+    return accuracy, latency_ms
+
+
+def build_report(paths, model_path=MODEL_PATH, data_dir=DATA_DIR, report_path=REPORT_PATH):
+    x, y = load_samples(data_dir, limit=EVAL_SAMPLES)
+    rows = []
+    for path in [model_path] + paths:
+        try:
+            predictor = open_model(path)
+        except ImportError as e:
+            print(f"⚠️ Skipping {path}: {e}")
+            continue
+        accuracy, latency_ms = evaluate(predictor, x, y)
+        rows.append({
+            "variant": os.path.basename(path),
+            "backend": predictor.backend,
+            "size_kb": round(os.path.getsize(path) / 1024, 1),
+            "accuracy": round(accuracy, 4),
+            "latency_ms": round(latency_ms, 3),
+        })
+
+    baseline = rows[0]["accuracy"]
+    for row in rows:
+        row["accuracy_delta"] = round(row["accuracy"] - baseline, 4)
+
+    print(f"\n📊 Evaluated on {len(x)} images from '{data_dir}'")
+    print(f"{'variant':42} {'size KB':>9} {'acc':>7} {'Δacc':>8} {'ms/img':>8}")
+    for row in rows:
+        print(f"{row['variant']:42} {row['size_kb']:>9} {row['accuracy']:>7.4f} "
+              f"{row['accuracy_delta']:>+8.4f} {row['latency_ms']:>8.3f}")
+
+    with open(report_path, "w") as f:
+        json.dump({"samples": len(x), "variants": rows}, f, indent=2)
+    print(f"📝 Report written to {report_path}")
+    return rows
+
+
+if __name__ == "__main__":
+    build_report(export_all())
@@ -3,6 +3,8 @@ import shutil
 import random
 import string
 
+from catalog import Catalog
+
 # === CONFIG ===
 SOURCE_DIR = "flat_folder2"
 DEST_DIR = "preclean_folder"
@@ -11,6 +13,12 @@ VALID_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
 # === CREATE DESTINATION IF NOT EXISTS ===
 os.makedirs(DEST_DIR, exist_ok=True)
 
+# === NAMES ALREADY TAKEN ===
+# Catalogued names plus one listing for files copied in by hand; every
+# candidate is then a set lookup instead of an os.path.exists probe.
+catalog = Catalog()
+taken = catalog.names_in(DEST_DIR) | set(os.listdir(DEST_DIR))
+
 # === RANDOM SUFFIX GENERATOR ===
 def random_suffix(length=2):
     return ''.join(random.choices(string.ascii_lowercase, k=length))
@@ -23,15 +31,18 @@ for file in os.listdir(SOURCE_DIR):
         base = os.path.splitext(file)[0]
         suffix = random_suffix()
         new_name = f"{base}_{suffix}{ext}"
-        dest_path = os.path.join(DEST_DIR, new_name)
 
         # Just in case — add more randomness if needed
-        while os.path.exists(dest_path):
+        while new_name in taken:
             suffix = random_suffix(3)
             new_name = f"{base}_{suffix}{ext}"
-            dest_path = os.path.join(DEST_DIR, new_name)
+        taken.add(new_name)
 
-        shutil.move(os.path.join(SOURCE_DIR, file), dest_path)
+        src_path = os.path.join(SOURCE_DIR, file)
+        dest_path = os.path.join(DEST_DIR, new_name)
+        shutil.move(src_path, dest_path)
+        catalog.move(src_path, dest_path, source="rename")
         moved += 1
 
+catalog.close()
 print(f"✅ Moved {moved} files with unique filenames to '{DEST_DIR}'")
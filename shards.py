@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset import DATA_DIR, list_images
+from preprocess import IMAGE_SIZE, load_rgb, to_float
+
+# ==== CONFIG ====
+SHARD_DIR = "shards"
+INDEX_NAME = "index.json"
+SHARD_SIZE = 4096  # samples per shard file, ~200 MB of uint8 RGB
+
+
+# ==== LAYOUT ====
+# shards/shard_00000.npy   uint8 (N, 128, 128, 3), already run through preprocess.load_rgb
+# shards/index.json        shard list + one entry per live sample:
+#                          [path, label, shard, offset, mtime, size]
+# Shards are written once and never modified. Adding images writes new
+# shards; removed or changed images only drop out of the index until the
+# next --rebuild.
+def _index_path(shard_dir):
+    return os.path.join(shard_dir, INDEX_NAME)
+
+
+def load_index(shard_dir=SHARD_DIR):
+    try:
+        with open(_index_path(shard_dir), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"image_size": IMAGE_SIZE, "shards": [], "samples": []}
+
+
+def _save_index(index, shard_dir):
+    tmp = _index_path(shard_dir) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, _index_path(shard_dir))
+
+
+def _write_shard(shard_dir, shard_id, batch):
+    filename = f"shard_{shard_id:05d}.npy"
+    images = np.lib.format.open_memmap(os.path.join(shard_dir, filename), mode="w+",
+                                       dtype=np.uint8, shape=(len(batch), IMAGE_SIZE, IMAGE_SIZE, 3))
+    entries = []
+    kept = 0
+    for path, label, stat in batch:
+        if load_rgb(path, out=images[kept]) is None:
+            continue
+        entries.append([path, label, shard_id, kept, stat.st_mtime, stat.st_size])
+        kept += 1
+    images.flush()
+    del images
+    return {"file": filename, "count": kept}, entries
+
+
+# ==== PACKER ====
+def pack(data_dir=DATA_DIR, shard_dir=SHARD_DIR, rebuild=False):
+    os.makedirs(shard_dir, exist_ok=True)
+    index = {"image_size": IMAGE_SIZE, "shards": [], "samples": []} if rebuild else load_index(shard_dir)
+    if rebuild:
+        for name in os.listdir(shard_dir):
+            if name.startswith("shard_") and name.endswith(".npy"):
+                os.remove(os.path.join(shard_dir, name))
+
+    known = {entry[0]: entry for entry in index["samples"]}
+    live, todo, seen = [], [], set()
+    for path, label in list_images(data_dir):
+        seen.add(path)
+        stat = os.stat(path)
+        entry = known.get(path)
+        if entry is not None and entry[4] == stat.st_mtime and entry[5] == stat.st_size and entry[1] == label:
+            live.append(entry)
+        else:
+            todo.append((path, label, stat))
+    changed = sum(1 for path, _, _ in todo if path in known)
+    removed = sum(1 for path in known if path not in seen)
+
+    start = time.perf_counter()
+    next_id = len(index["shards"])
+    for i in range(0, len(todo), SHARD_SIZE):
+        shard, entries = _write_shard(shard_dir, next_id, todo[i:i + SHARD_SIZE])
+        index["shards"].append(shard)
+        live.extend(entries)
+        next_id += 1
+
+    index["samples"] = live
+    _save_index(index, shard_dir)
+    elapsed = time.perf_counter() - start
+    print(f"📦 {len(live)} samples in {len(index['shards'])} shards | new {len(todo) - changed}, "
+          f"changed {changed}, removed {removed} ({elapsed:.1f} s)")
+    return index
+
+
+# ==== LOADER ====
+class ShardDataset:
+    # Memory-maps every shard; indexing returns views into the mapped files,
+    # so random access costs a page fault, not a JPEG decode.
+    def __init__(self, shard_dir=SHARD_DIR):
+        index = load_index(shard_dir)
+        if not index["samples"]:
+            raise FileNotFoundError(f"No packed samples in '{shard_dir}', run shards.py first")
+        self.shards = [np.load(os.path.join(shard_dir, s["file"]), mmap_mode="r") for s in index["shards"]]
+        samples = index["samples"]
+        self.paths = [entry[0] for entry in samples]
+        self.labels = np.array([entry[1] for entry in samples], dtype=np.float32)
+        self._shard = np.array([entry[2] for entry in samples], dtype=np.int32)
+        self._offset = np.array([entry[3] for entry in samples], dtype=np.int64)
+        self._by_path = {path: i for i, path in enumerate(self.paths)}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, i):
+        return self.shards[self._shard[i]][self._offset[i]], self.labels[i], self.paths[i]
+
+    def indices_for(self, paths):
+        return np.array([self._by_path[p] for p in paths if p in self._by_path], dtype=np.int64)
+
+    def gather(self, indices, out=None):
+        # Copies the selected samples into one contiguous uint8 batch
+        if out is None:
+            out = np.empty((len(indices), IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+        for j, i in enumerate(indices):
+            out[j] = self.shards[self._shard[i]][self._offset[i]]
+        return out
+
+    def load_paths(self, samples):
+        # Float32 (x, y) for (path, label) samples, as decoding each file would
+        # give, without touching a JPEG. None when any of them is not packed
+        # (added since the last shards.py run), so the caller decodes instead.
+        indices = self.indices_for([path for path, _ in samples])
+        if len(indices) < len(samples):
+            return None
+        return to_float(self.gather(indices)), np.array([label for _, label in samples], dtype=np.int32)
+
+
+def open_shards(shard_dir=SHARD_DIR):
+    # None until shards.py has packed something
+    if not os.path.exists(_index_path(shard_dir)):
+        return None
+    try:
+        return ShardDataset(shard_dir)
+    except FileNotFoundError:
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack dataset images into memory-mappable shards")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--shard-dir", default=SHARD_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="discard existing shards and repack everything")
+    args = parser.parse_args()
+    pack(args.data_dir, args.shard_dir, args.rebuild)
@@ -0,0 +1,247 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# TensorFlow is only imported inside the trial processes, after their
+# thread limits are set, so this module stays cheap to spawn.
+
+# ==== CONFIG ====
+RESULTS_PATH = "sweep_results.db"
+SWEEP_DIR = "sweeps"
+WORKERS = 2
+EPOCHS = 5
+MIN_EPOCHS = 2       # a trial is never pruned before this many epochs
+MIN_PEERS = 3        # ... nor before this many other trials reported the same epoch
+LATENCY_RUNS = 50
+SPACE = {
+    "batch_size": [16, 32, 64],
+    "learning_rate": [3e-4, 1e-3, 3e-3],
+    "conv_filters": [[16, 32, 64], [32, 64, 128]],
+    "dense_units": [64, 128, 256],
+    "dropout": [0.2, 0.3, 0.5],
+    "augment_scale": [0.5, 1.0, 2.0],  # multiplies every train.AUGMENTATION range
+}
+
+
+# ==== RESULTS STORE ====
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    sweep         TEXT,
+    trial         INTEGER,
+    params        TEXT,
+    status        TEXT,     -- running / done / pruned / failed
+    val_accuracy  REAL,
+    train_seconds REAL,
+    latency_ms    REAL,
+    parameters    INTEGER,
+    model_path    TEXT,
+    error         TEXT,
+    PRIMARY KEY (sweep, trial)
+);
+CREATE TABLE IF NOT EXISTS epochs (
+    sweep        TEXT,
+    trial        INTEGER,
+    epoch        INTEGER,
+    val_accuracy REAL,
+    val_loss     REAL,
+    PRIMARY KEY (sweep, trial, epoch)
+);
+CREATE INDEX IF NOT EXISTS idx_epochs_sweep_epoch ON epochs(sweep, epoch);
+"""
+
+
+class ResultsStore:
+    # One connection per process; trials in different processes write to the
+    # same file, serialized by SQLite's own locking.
+    def __init__(self, path=RESULTS_PATH):
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def start_trial(self, sweep, trial, params):
+        self.conn.execute("INSERT OR REPLACE INTO trials (sweep, trial, params, status) VALUES (?, ?, ?, 'running')",
+                          (sweep, trial, json.dumps(params)))
+
+    def finish_trial(self, sweep, trial, **fields):
+        columns = ", ".join(f"{k} = ?" for k in fields)
+        self.conn.execute(f"UPDATE trials SET {columns} WHERE sweep = ? AND trial = ?",
+                          (*fields.values(), sweep, trial))
+
+    def log_epoch(self, sweep, trial, epoch, val_accuracy, val_loss):
+        self.conn.execute("INSERT OR REPLACE INTO epochs VALUES (?, ?, ?, ?, ?)",
+                          (sweep, trial, epoch, val_accuracy, val_loss))
+
+    def peer_accuracies(self, sweep, trial, epoch):
+        rows = self.conn.execute("SELECT val_accuracy FROM epochs WHERE sweep = ? AND epoch = ? AND trial != ?",
+                                 (sweep, epoch, trial))
+        return [r[0] for r in rows]
+
+    def trials(self, sweep):
+        rows = self.conn.execute("SELECT trial, params, status, val_accuracy, train_seconds, latency_ms, parameters "
+                                 "FROM trials WHERE sweep = ? ORDER BY trial", (sweep,))
+        return [dict(zip(("trial", "params", "status", "val_accuracy", "train_seconds", "latency_ms",
+                          "parameters"), r)) for r in rows]
+
+
+# ==== SEARCH SPACE ====
+def sample_trials(space, count, seed=0):
+    # The full grid when it fits in `count`, otherwise a random subset of it
+    keys = sorted(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+    if len(grid) <= count:
+        return grid
+    return random.Random(seed).sample(grid, count)
+
+
+def scaled_augmentation(scale):
+    from train import AUGMENTATION
+    low, high = AUGMENTATION["brightness_range"]
+    return dict(
+        rotation_range=AUGMENTATION["rotation_range"] * scale,
+        zoom_range=AUGMENTATION["zoom_range"] * scale,
+        width_shift_range=AUGMENTATION["width_shift_range"] * scale,
+        height_shift_range=AUGMENTATION["height_shift_range"] * scale,
+        brightness_range=[1 - (1 - low) * scale, 1 + (high - 1) * scale],
+    )
+
+
+# ==== TRIAL PROCESS ====
+def _limit_threads(threads):
+    # Runs first in every pool process, before TensorFlow is imported
+    for var in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import cv2
+    import tensorflow as tf
+    cv2.setNumThreads(1)
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _median_stopper(store, sweep, trial):
+    # Median stopping rule: after MIN_EPOCHS, stop a trial whose validation
+    # accuracy is below the median of the other trials at the same epoch.
+    import tensorflow as tf
+
+    class MedianStop(tf.keras.callbacks.Callback):
+        pruned = False
+
+        def on_epoch_end(self, epoch, logs=None):
+            logs = logs or {}
+            accuracy = float(logs.get("val_accuracy", 0.0))
+            store.log_epoch(sweep, trial, epoch, accuracy, float(logs.get("val_loss", 0.0)))
+            peers = store.peer_accuracies(sweep, trial, epoch)
+            if epoch + 1 >= MIN_EPOCHS and len(peers) >= MIN_PEERS and accuracy < statistics.median(peers):
+                self.pruned = True
+                self.model.stop_training = True
+
+    return MedianStop()
+
+
+def measure_latency(model_path, runs=LATENCY_RUNS):
+    # Single-frame latency through the same front end the app uses
+    import numpy as np
+    from predictor import Predictor
+
+    predictor = Predictor(model_path, max_batch=1)
+    frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        predictor.predict_frame(frame)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def run_trial(sweep, trial, params, epochs, results_path):
+    from train import train
+
+    store = ResultsStore(results_path)
+    store.start_trial(sweep, trial, params)
+    model_path = os.path.join(SWEEP_DIR, sweep, f"trial_{trial:03d}.h5")
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    stopper = _median_stopper(store, sweep, trial)
+    try:
+        start = time.perf_counter()
+        model = train("tfdata", epochs=epochs, batch_size=params["batch_size"], model_path=model_path,
+                      augmentation=scaled_augmentation(params["augment_scale"]),
+                      model_options=dict(conv_filters=params["conv_filters"], dense_units=params["dense_units"],
+                                         dropout=params["dropout"], learning_rate=params["learning_rate"]),
+                      callbacks=[stopper])
+        seconds = time.perf_counter() - start
+        # Accuracy at the epoch early stopping restored (lowest val_loss)
+        history = model.history.history
+        best = min(range(len(history["val_loss"])), key=history["val_loss"].__getitem__)
+        result = dict(status="pruned" if stopper.pruned else "done",
+                      val_accuracy=float(history["val_accuracy"][best]), train_seconds=seconds,
+                      latency_ms=measure_latency(model_path), parameters=int(model.count_params()),
+                      model_path=model_path)
+    except Exception as e:
+        result = dict(status="failed", error=f"{type(e).__name__}: {e}")
+    store.finish_trial(sweep, trial, **result)
+    return trial, result
+
+
+# ==== SWEEP ====
+def run_sweep(space=SPACE, trials=12, workers=WORKERS, epochs=EPOCHS, results_path=RESULTS_PATH, seed=0):
+    sweep = time.strftime("%Y%m%d-%H%M%S")
+    configs = sample_trials(space, trials, seed)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"🧪 Sweep {sweep}: {len(configs)} trials, {workers} at a time, {threads} threads each")
+
+    # spawn: TensorFlow is not fork-safe, and every trial needs its own limits
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_limit_threads,
+                             initargs=(threads,)) as pool:
+        futures = [pool.submit(run_trial, sweep, i, params, epochs, results_path)
+                   for i, params in enumerate(configs)]
+        for future in as_completed(futures):
+            trial, result = future.result()
+            if result["status"] == "failed":
+                print(f"❌ trial {trial}: {result['error']}")
+            else:
+                print(f"✅ trial {trial} {result['status']}: acc {result['val_accuracy']:.4f}, "
+                      f"{result['train_seconds']:.0f} s, {result['latency_ms']:.2f} ms/frame")
+    return sweep
+
+
+def print_report(sweep, results_path=RESULTS_PATH):
+    rows = [r for r in ResultsStore(results_path).trials(sweep) if r["val_accuracy"] is not None]
+    # Pareto front: no other trial is both at least as accurate and faster
+    for r in rows:
+        r["pareto"] = not any(o is not r and o["val_accuracy"] >= r["val_accuracy"]
+                              and o["latency_ms"] < r["latency_ms"] for o in rows)
+    print(f"\n{'trial':>5} {'status':>7} {'val_acc':>8} {'train_s':>8} {'ms/frame':>9} {'params':>10}  config")
+    for r in sorted(rows, key=lambda r: -r["val_accuracy"]):
+        print(f"{r['trial']:>5} {r['status']:>7} {r['val_accuracy']:>8.4f} {r['train_seconds']:>8.0f} "
+              f"{r['latency_ms']:>9.2f} {r['parameters']:>10,} {'*' if r['pareto'] else ' '} {r['params']}")
+    print("* = on the accuracy / latency Pareto front")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep over train.py")
+    parser.add_argument("--space", help="JSON file mapping parameter names to candidate lists "
+                                        f"(keys: {', '.join(sorted(SPACE))})")
+    parser.add_argument("--trials", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", metavar="SWEEP", help="only print the table for an earlier sweep")
+    args = parser.parse_args()
+
+    if args.report:
+        print_report(args.report)
+    else:
+        space = dict(SPACE)
+        if args.space:
+            with open(args.space, "r") as f:
+                space.update(json.load(f))
+        print_report(run_sweep(space, args.trials, args.workers, args.epochs, seed=args.seed))
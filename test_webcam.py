@@ -1,45 +1,111 @@
+import argparse
 import cv2
-import numpy as np
-import tensorflow as tf
 
-# === Load the trained model ===
-model = tf.keras.models.load_model("cnn1_hand_vs_nohand_final.h5")
+from cascade import CascadeClassifier, load_config
+from motionGate import GatedClassifier, MotionGate, PIXEL_DELTA, CHANGED_FRACTION, MAX_STALE_S
+from pipeline import RecognitionPipeline
+from predictor import MODES, load_predictor
 
 # === Config ===
-IMAGE_SIZE = 128
-LABELS = ["No Hand", "Hand"]
+WINDOW_NAME = "Hand Detection"
 
-# === Open webcam ===
-cap = cv2.VideoCapture(0)
-cv2.namedWindow("Hand Detection", cv2.WINDOW_NORMAL)
 
-print("📷 Press 'Q' to quit")
+def annotate(frame, label, confidence):
+    color = (0, 255, 0) if label == "Hand" else (0, 0, 255)
+    cv2.putText(frame, f"{label} ({confidence*100:.2f}%)", (10, 40),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
 
-    # Flip and preprocess the frame
-    frame = cv2.flip(frame, 1)
-    resized = cv2.resize(frame, (IMAGE_SIZE, IMAGE_SIZE))
-    normalized = resized / 255.0
-    input_img = np.expand_dims(normalized, axis=0)  # shape: (1, 128, 128, 3)
+# === Serial loop: capture, predict and display one after another ===
+def run_serial(cap, predictor):
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
 
-    # === Predict ===
-    prediction = model.predict(input_img, verbose=0)[0][0]
-    label = LABELS[1] if prediction > 0.5 else LABELS[0]
-    confidence = prediction if prediction > 0.5 else 1 - prediction
+        frame = cv2.flip(frame, 1)
+        label, confidence = predictor.classify(frame)
+        annotate(frame, label, confidence)
 
-    # === Display prediction ===
-    color = (0, 255, 0) if label == "Hand" else (0, 0, 255)
-    cv2.putText(frame, f"{label} ({confidence*100:.2f}%)", (10, 40),
-                cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
+        cv2.imshow(WINDOW_NAME, frame)
+
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+
+# === Pipeline loop: capture and inference on their own threads ===
+def run_pipeline(cap, predictor):
+    pipeline = RecognitionPipeline(cap, predictor.classify)
+    pipeline.start()
+    try:
+        while True:
+            result = pipeline.latest_result(timeout=0.5)
+            if result is None:
+                if not pipeline.running:
+                    break
+            else:
+                annotate(result.image, result.label, result.confidence)
+                cv2.imshow(WINDOW_NAME, result.image)
+
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        pipeline.stop()
+
+    stats = pipeline.stats()
+    print(f"📊 Captured {stats['captured']} | Inferred {stats['inferred']} | Displayed {stats['displayed']}")
+    print(f"🗑️ Dropped before inference: {stats['dropped_before_inference']} | "
+          f"before display: {stats['dropped_before_display']}")
+    print(f"⏱️ Latency avg {stats['avg_latency_ms']:.1f} ms | max {stats['max_latency_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live hand / no-hand webcam test")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run capture and inference on separate threads, always classifying the newest frame")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--model", choices=MODES,
+                        help="detection model backend (default: the Settings page choice)")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="only run the CNN when the scene changed, otherwise reuse the last prediction")
+    parser.add_argument("--pixel-delta", type=int, default=PIXEL_DELTA)
+    parser.add_argument("--changed-fraction", type=float, default=CHANGED_FRACTION)
+    parser.add_argument("--max-stale", type=float, default=MAX_STALE_S)
+    parser.add_argument("--cascade", action="store_true",
+                        help="skip the CNN on dark, blurred or skin-free frames (also enabled via user_settings.json)")
+    args = parser.parse_args()
+
+    # === Load the trained model (traced and warmed up) ===
+    predictor = load_predictor(args.model)
+    print(f"🧠 Using {predictor.backend} backend: {predictor.model_path}")
+
+    # === Open webcam ===
+    cap = cv2.VideoCapture(args.camera)
+    cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
+
+    classifier = predictor
+    cascade_config = load_config()
+    if args.cascade or cascade_config["enabled"]:
+        classifier = CascadeClassifier(predictor, cascade_config)
+    if args.motion_gate:
+        classifier = GatedClassifier(classifier, MotionGate(args.pixel_delta, args.changed_fraction, args.max_stale))
+
+    print("📷 Press 'Q' to quit")
 
-    cv2.imshow("Hand Detection", frame)
+    if args.pipeline:
+        run_pipeline(cap, classifier)
+    else:
+        run_serial(cap, classifier)
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+    if isinstance(classifier, GatedClassifier):
+        stats = classifier.stats()
+        print(f"🚦 Motion gate: {stats['inferences']}/{stats['frames']} frames inferred, "
+              f"{stats['skipped_fraction']*100:.1f}% skipped")
+        classifier = classifier.predictor
+    if isinstance(classifier, CascadeClassifier):
+        stats = classifier.stats()
+        print(f"🪜 Cascade: {stats['pass_through_rate']*100:.1f}% of frames reached the CNN, "
+              f"rejected {stats['rejected']}")
 
-cap.release()
-cv2.destroyAllWindows()
+    cap.release()
+    cv2.destroyAllWindows()
@@ -1,18 +1,27 @@
+import argparse
+import time
+
+import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
 
+from dataset import VALIDATION_SPLIT, split_samples
+from finetune import finetune, record_run
+from preprocess import IMAGE_SIZE, load_rgb_batch, check_parity
+from quantize import export_all, build_report
+
 # ==== CONFIG ====
 DATA_DIR = "dataset1"
-IMAGE_SIZE = 128
+MODEL_PATH = "cnn1_hand_vs_nohand_final.h5"
 BATCH_SIZE = 32
 EPOCHS = 5
-
-# ==== DATA LOADERS ====
-datagen = ImageDataGenerator(
-    rescale=1./255,
-    validation_split=0.1,
+LEARNING_RATE = 1e-3  # Adam's default
+CONV_FILTERS = (32, 64, 128)
+DENSE_UNITS = 128
+DROPOUT = 0.3
+AUGMENTATION = dict(
     rotation_range=5,
     zoom_range=0.05,
     width_shift_range=0.05,
@@ -20,61 +29,175 @@ datagen = ImageDataGenerator(
     brightness_range=[0.9, 1.1]
 )
 
-train_generator = datagen.flow_from_directory(
-    DATA_DIR,
-    target_size=(IMAGE_SIZE, IMAGE_SIZE),
-    batch_size=BATCH_SIZE,
-    class_mode='binary',
-    subset='training'
-)
 
-val_generator = datagen.flow_from_directory(
-    DATA_DIR,
-    target_size=(IMAGE_SIZE, IMAGE_SIZE),
-    batch_size=BATCH_SIZE,
-    class_mode='binary',
-    subset='validation'
-)
+# ==== DATA LOADERS ====
+def _load_arrays(samples):
+    images, kept = load_rgb_batch([path for path, _ in samples])
+    labels = np.array([samples[i][1] for i in kept], dtype=np.float32)
+    return images, labels
+
+
+def make_generators(data_dir=DATA_DIR, batch_size=BATCH_SIZE, dedupe=False, augmentation=AUGMENTATION):
+    # Images are decoded and resized by preprocess.py, the same code every
+    # inference path uses; the generator only augments and rescales.
+    datagen = ImageDataGenerator(
+        rescale=1./255,
+        **augmentation
+    )
+
+    train_samples, val_samples = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    check_parity([path for path, _ in train_samples[:8]], datagen)
+
+    train_generator = datagen.flow(
+        *_load_arrays(train_samples),
+        batch_size=batch_size
+    )
+
+    val_generator = datagen.flow(
+        *_load_arrays(val_samples),
+        batch_size=batch_size
+    )
+    return train_generator, val_generator
+
+
+def make_tf_datasets(data_dir=DATA_DIR, batch_size=BATCH_SIZE, dedupe=False, augmentation=AUGMENTATION):
+    # Parallel decode, cache after the first epoch, batched augmentation,
+    # prefetch. Validation is not augmented.
+    from dataPipeline import make_augmenter, make_dataset
+
+    train_samples, val_samples = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    train_ds = make_dataset(train_samples, batch_size, augment=make_augmenter(**augmentation))
+    val_ds = make_dataset(val_samples, batch_size, training=False)
+    return train_ds, val_ds
+
+
+def make_shard_datasets(data_dir=DATA_DIR, batch_size=BATCH_SIZE, dedupe=False, augmentation=AUGMENTATION):
+    # Reads the pre-resized samples packed by shards.py; the split is taken
+    # by path so it matches the other input modes.
+    from dataPipeline import make_augmenter, make_shard_dataset
+    from shards import ShardDataset, pack
+
+    pack(data_dir)  # incremental: only new or changed images are decoded
+    shards = ShardDataset()
+    train_samples, val_samples = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    train_idx = shards.indices_for([path for path, _ in train_samples])
+    val_idx = shards.indices_for([path for path, _ in val_samples])
+    train_ds = make_shard_dataset(shards, train_idx, batch_size, augment=make_augmenter(**augmentation))
+    val_ds = make_shard_dataset(shards, val_idx, batch_size, training=False)
+    return train_ds, val_ds
+
+
+def make_inputs(mode, data_dir=DATA_DIR, batch_size=BATCH_SIZE, dedupe=False, augmentation=AUGMENTATION):
+    if mode == "tfdata":
+        return make_tf_datasets(data_dir, batch_size, dedupe, augmentation)
+    if mode == "shards":
+        return make_shard_datasets(data_dir, batch_size, dedupe, augmentation)
+    return make_generators(data_dir, batch_size, dedupe, augmentation)
+
+
+def measure_input(mode, data_dir=DATA_DIR, batch_size=BATCH_SIZE, epochs=2):
+    # Images/sec of the input pipeline alone, one line per epoch so the
+    # effect of the tf.data cache shows up in epoch 2.
+    start = time.perf_counter()
+    train_input, _ = make_inputs(mode, data_dir, batch_size)
+    print(f"⏱️ {mode:>9} setup: {time.perf_counter() - start:.2f} s")
+    steps = len(train_input) if mode == "generator" else None
+    for epoch in range(epochs):
+        count = 0
+        start = time.perf_counter()
+        for step, (images, _) in enumerate(train_input):
+            count += int(images.shape[0])
+            if steps is not None and step + 1 >= steps:
+                break
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ {mode:>9} epoch {epoch + 1}: {count / elapsed:8.1f} images/sec ({count} images)")
+
 
 # ==== MODEL ====
-model = models.Sequential([
-    layers.Input(shape=(IMAGE_SIZE, IMAGE_SIZE, 3)),
-    layers.Conv2D(32, (3, 3), activation='relu'),
-    layers.MaxPooling2D(),
-    layers.Conv2D(64, (3, 3), activation='relu'),
-    layers.MaxPooling2D(),
-    layers.Conv2D(128, (3, 3), activation='relu'),
-    layers.MaxPooling2D(),
-    layers.Flatten(),
-    layers.Dense(128, activation='relu'),
-    layers.Dropout(0.3),
-    layers.Dense(1, activation='sigmoid')
-])
-
-model.compile(optimizer='adam',
-              loss='binary_crossentropy',
-              metrics=['accuracy'])
-
-# ==== CALLBACKS ====
-early_stop = EarlyStopping(
-    monitor='val_loss',
-    patience=2,
-    restore_best_weights=True
-)
+def build_model(conv_filters=CONV_FILTERS, dense_units=DENSE_UNITS, dropout=DROPOUT,
+                learning_rate=LEARNING_RATE):
+    conv = []
+    for filters in conv_filters:
+        conv += [layers.Conv2D(filters, (3, 3), activation='relu'), layers.MaxPooling2D()]
+    model = models.Sequential([
+        layers.Input(shape=(IMAGE_SIZE, IMAGE_SIZE, 3)),
+        *conv,
+        layers.Flatten(),
+        layers.Dense(dense_units, activation='relu'),
+        layers.Dropout(dropout),
+        layers.Dense(1, activation='sigmoid')
+    ])
+
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate),
+                  loss='binary_crossentropy',
+                  metrics=['accuracy'])
+    return model
 
-checkpoint = ModelCheckpoint(
-    "cnn1_hand_vs_nohand_final.h5",
-    monitor="val_loss",
-    save_best_only=True,
-    verbose=1
-)
 
 # ==== TRAIN ====
-model.fit(
-    train_generator,
-    validation_data=val_generator,
-    epochs=EPOCHS,
-    callbacks=[early_stop, checkpoint]
-)
+def train(input_mode="generator", data_dir=DATA_DIR, epochs=EPOCHS, batch_size=BATCH_SIZE,
+          model_path=MODEL_PATH, dedupe=False, augmentation=AUGMENTATION, model_options=None,
+          callbacks=()):
+    # model_options are build_model() keyword arguments; callbacks are added
+    # to the default early stopping + checkpoint (sweep.py uses both).
+    train_input, val_input = make_inputs(input_mode, data_dir, batch_size, dedupe, augmentation)
+    model = build_model(**(model_options or {}))
+
+    early_stop = EarlyStopping(
+        monitor='val_loss',
+        patience=2,
+        restore_best_weights=True
+    )
+
+    checkpoint = ModelCheckpoint(
+        model_path,
+        monitor="val_loss",
+        save_best_only=True,
+        verbose=1
+    )
+
+    model.fit(
+        train_input,
+        validation_data=val_input,
+        epochs=epochs,
+        callbacks=[early_stop, checkpoint, *callbacks]
+    )
+
+    # A full retrain starts from random weights, so its ledger starts empty
+    train_samples, _ = split_samples(data_dir, VALIDATION_SPLIT, dedupe)
+    record_run(model_path, train_samples, {"samples": {}, "runs": []}, mode="full", epochs=epochs)
+
+    print(f"✅ Training complete. Model saved as {model_path}")
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the hand / no-hand CNN")
+    parser.add_argument("--input", choices=["generator", "tfdata", "shards"], default="generator",
+                        help="ImageDataGenerator (original), the parallel tf.data pipeline, "
+                             "or tf.data over the memory-mapped shards from shards.py")
+    parser.add_argument("--compare-input", action="store_true",
+                        help="only measure images/sec of both input pipelines, no training")
+    parser.add_argument("--epochs", type=int, default=None,
+                        help=f"default {EPOCHS}, or finetune.py's own default with --finetune")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dedupe-split", action="store_true",
+                        help="keep perceptual near-duplicates on the same side of the train/val split")
+    parser.add_argument("--finetune", action="store_true",
+                        help="warm-start from the saved model on new samples only (see finetune.py)")
+    parser.add_argument("--skip-export", action="store_true", help="do not write the quantized models")
+    args = parser.parse_args()
+
+    if args.compare_input:
+        for mode in ("generator", "tfdata", "shards"):
+            measure_input(mode, DATA_DIR, args.batch_size)
+    else:
+        if args.finetune:
+            epochs = {} if args.epochs is None else {"epochs": args.epochs}
+            finetune(MODEL_PATH, DATA_DIR, batch_size=args.batch_size, dedupe=args.dedupe_split, **epochs)
+        else:
+            train(args.input, DATA_DIR, args.epochs or EPOCHS, args.batch_size, dedupe=args.dedupe_split)
 
-print("✅ Training complete. Model saved as cnn1_hand_vs_nohand_final.h5")
+        # ==== QUANTIZED EXPORTS (used by the "Fast" detection model) ====
+        if not args.skip_export:
+            build_report(export_all(MODEL_PATH, DATA_DIR))
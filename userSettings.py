@@ -0,0 +1,25 @@
+import json
+
+# ==== CONFIG ====
+SETTINGS_PATH = "user_settings.json"
+DEFAULTS = {
+    "sensitivity": 50,
+    "cooldown": 1,
+    "confidence": 85,
+    "model": "Accurate",
+}
+
+
+def load_settings(path=SETTINGS_PATH):
+    settings = dict(DEFAULTS)
+    try:
+        with open(path, "r") as f:
+            settings.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return settings
+
+
+def save_settings(settings, path=SETTINGS_PATH):
+    with open(path, "w") as f:
+        json.dump(settings, f, indent=2)